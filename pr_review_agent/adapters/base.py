@@ -5,9 +5,13 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from datetime import datetime
+import sys
 
+# Use __slots__ for the per-file records where the interpreter supports it (3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class PRInfo:
     """Pull Request information"""
     id: str
@@ -28,7 +32,7 @@ class PRInfo:
     commits: int
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FileChange:
     """Represents a changed file in a PR"""
     filename: str
@@ -40,7 +44,7 @@ class FileChange:
     content_after: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ReviewComment:
     """Represents a review comment"""
     file_path: str
@@ -2,7 +2,7 @@
 Analyzers package initialization
 """
 
-from .base import BaseAnalyzer, AnalysisResult, CodeIssue
+from .base import BaseAnalyzer, AnalysisResult, AnalyzerContext, CodeIssue
 from .manager import AnalysisManager
 
-__all__ = ["BaseAnalyzer", "AnalysisResult", "CodeIssue", "AnalysisManager"]
+__all__ = ["BaseAnalyzer", "AnalysisResult", "AnalyzerContext", "CodeIssue", "AnalysisManager"]
@@ -2,13 +2,71 @@
 Base analyzer interface for code analysis
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
 import re
 import ast
+import sys
 
+# Issues are allocated per finding, so drop the instance __dict__ on 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# File extension to language lookup, checked in order
+EXTENSION_LANGUAGES = (
+    ('.py', 'python'),
+    ('.js', 'javascript'),
+    ('.ts', 'typescript'),
+    ('.jsx', 'javascript'),
+    ('.tsx', 'typescript'),
+    ('.java', 'java'),
+    ('.cpp', 'cpp'),
+    ('.cc', 'cpp'),
+    ('.cxx', 'cpp'),
+    ('.c', 'c'),
+    ('.h', 'c'),
+    ('.hpp', 'cpp'),
+    ('.go', 'go'),
+    ('.rs', 'rust'),
+    ('.rb', 'ruby'),
+    ('.php', 'php'),
+    ('.cs', 'csharp'),
+    ('.swift', 'swift'),
+    ('.kt', 'kotlin'),
+    ('.scala', 'scala'),
+    ('.sh', 'shell'),
+    ('.bash', 'shell'),
+    ('.zsh', 'shell'),
+    ('.yml', 'yaml'),
+    ('.yaml', 'yaml'),
+    ('.json', 'json'),
+    ('.xml', 'xml'),
+    ('.html', 'html'),
+    ('.css', 'css'),
+    ('.scss', 'scss'),
+    ('.sql', 'sql'),
+)
+
+# Patterns for common hardcoded secrets
+SECRET_PATTERNS = (
+    (r'password\s*=\s*["\'][^"\']+["\']', 'hardcoded_password'),
+    (r'api_key\s*=\s*["\'][^"\']+["\']', 'hardcoded_api_key'),
+    (r'secret\s*=\s*["\'][^"\']+["\']', 'hardcoded_secret'),
+    (r'token\s*=\s*["\'][^"\']+["\']', 'hardcoded_token'),
+)
+
+# Simple pattern matching for string concatenation in SQL
+SQL_INJECTION_PATTERNS = (
+    r'SELECT.*\+.*',
+    r'INSERT.*\+.*',
+    r'UPDATE.*\+.*',
+    r'DELETE.*\+.*',
+)
+
+# JavaScript "var" declarations (should use let/const)
+VAR_DECLARATION = re.compile(r'\bvar\s+')
+
+
+@dataclass(**_SLOTS)
 class AnalysisResult:
     """Result of code analysis"""
     file_path: str
@@ -17,7 +75,7 @@ class AnalysisResult:
     language: str
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class CodeIssue:
     """Represents a code issue found during analysis"""
     line_number: int
@@ -29,6 +87,44 @@ class CodeIssue:
     suggestion: Optional[str] = None
 
 
+@dataclass(**_SLOTS)
+class AnalyzerContext:
+    """A file prepared once and shared by every analyzer that inspects it
+    
+    Python sources are parsed on first access to ``tree`` or ``syntax_error``,
+    so files only seen by text-based analyzers are never parsed.
+    """
+    file_path: str
+    content: str
+    _tree: Optional[ast.AST] = field(default=None, init=False, repr=False)
+    _syntax_error: Optional[bool] = field(default=None, init=False, repr=False)  # None until parsed
+    
+    @property
+    def tree(self) -> Optional[ast.AST]:
+        """Parsed module for Python sources, None for other files or unparsable code"""
+        self._parse()
+        return self._tree
+    
+    @property
+    def syntax_error(self) -> bool:
+        """Whether a Python source could not be parsed"""
+        self._parse()
+        return self._syntax_error
+    
+    def _parse(self):
+        """Parse the content once; failures are reported as a syntax error"""
+        if self._syntax_error is not None:
+            return
+        
+        self._syntax_error = False
+        if self.file_path.lower().endswith('.py'):
+            try:
+                self._tree = ast.parse(self.content)
+            except (SyntaxError, ValueError, MemoryError, RecursionError):
+                # Null bytes raise ValueError; pathological nesting exhausts the parser
+                self._syntax_error = True
+
+
 class BaseAnalyzer(ABC):
     """Base class for code analyzers"""
     
@@ -45,44 +141,15 @@ class BaseAnalyzer(ABC):
         """Analyze the code content"""
         pass
     
+    def analyze_context(self, context: AnalyzerContext) -> AnalysisResult:
+        """Analyze a prepared file; AST-based analyzers override this to reuse context.tree"""
+        return self.analyze(context.file_path, context.content)
+    
     def get_language(self, file_path: str) -> str:
         """Determine the programming language from file extension"""
-        extension_map = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.jsx': 'javascript',
-            '.tsx': 'typescript',
-            '.java': 'java',
-            '.cpp': 'cpp',
-            '.cc': 'cpp',
-            '.cxx': 'cpp',
-            '.c': 'c',
-            '.h': 'c',
-            '.hpp': 'cpp',
-            '.go': 'go',
-            '.rs': 'rust',
-            '.rb': 'ruby',
-            '.php': 'php',
-            '.cs': 'csharp',
-            '.swift': 'swift',
-            '.kt': 'kotlin',
-            '.scala': 'scala',
-            '.sh': 'shell',
-            '.bash': 'shell',
-            '.zsh': 'shell',
-            '.yml': 'yaml',
-            '.yaml': 'yaml',
-            '.json': 'json',
-            '.xml': 'xml',
-            '.html': 'html',
-            '.css': 'css',
-            '.scss': 'scss',
-            '.sql': 'sql'
-        }
-        
-        for ext, lang in extension_map.items():
-            if file_path.lower().endswith(ext):
+        file_path = file_path.lower()
+        for ext, lang in EXTENSION_LANGUAGES:
+            if file_path.endswith(ext):
                 return lang
         
         return 'text'
@@ -91,30 +158,48 @@ class BaseAnalyzer(ABC):
 class StructureAnalyzer(BaseAnalyzer):
     """Analyzes code structure and organization"""
     
+    SUPPORTED_LANGUAGES = frozenset({'python', 'javascript', 'typescript', 'java', 'cpp', 'go'})
+    
     def can_analyze(self, file_path: str) -> bool:
         """Can analyze most programming languages"""
-        language = self.get_language(file_path)
-        return language in ['python', 'javascript', 'typescript', 'java', 'cpp', 'go']
+        return self.get_language(file_path) in self.SUPPORTED_LANGUAGES
     
     def analyze(self, file_path: str, content: str) -> AnalysisResult:
         """Analyze code structure"""
+        return self.analyze_context(AnalyzerContext(file_path, content))
+    
+    def analyze_context(self, context: AnalyzerContext) -> AnalysisResult:
+        """Analyze code structure using the shared Python AST"""
+        file_path = context.file_path
         language = self.get_language(file_path)
         issues = []
         metrics = {}
         
-        lines = content.split('\n')
+        lines = context.content.split('\n')
+        tree = context.tree if language == 'python' else None
+        syntax_error = language == 'python' and context.syntax_error
         
         # Common structure analysis
         issues.extend(self._check_file_length(lines))
         issues.extend(self._check_line_length(lines))
-        issues.extend(self._check_complexity(content, language))
+        issues.extend(self._check_complexity(tree))
         
         # Language-specific analysis
         if language == 'python':
-            issues.extend(self._analyze_python_structure(content))
-            metrics.update(self._get_python_metrics(content))
+            if syntax_error:
+                issues.append(CodeIssue(
+                    line_number=1,
+                    column=0,
+                    severity='error',
+                    category='syntax',
+                    message='Syntax error in Python code',
+                    rule_id='syntax_error'
+                ))
+            python_issues, python_metrics = self._analyze_python_tree(tree, lines)
+            issues.extend(python_issues)
+            metrics.update(python_metrics)
         elif language in ['javascript', 'typescript']:
-            issues.extend(self._analyze_js_structure(content))
+            issues.extend(self._analyze_js_structure(lines))
         
         return AnalysisResult(
             file_path=file_path,
@@ -143,105 +228,112 @@ class StructureAnalyzer(BaseAnalyzer):
     
     def _check_line_length(self, lines: List[str]) -> List[CodeIssue]:
         """Check for lines that are too long"""
-        issues = []
         max_length = self.config.get('max_line_length', 100)
         
-        for i, line in enumerate(lines, 1):
-            if len(line) > max_length:
-                issues.append(CodeIssue(
-                    line_number=i,
-                    column=max_length,
-                    severity='info',
-                    category='style',
-                    message=f'Line too long ({len(line)} > {max_length} characters)',
-                    rule_id='line_too_long',
-                    suggestion='Break long line into multiple lines'
-                ))
-        
-        return issues
+        return [
+            CodeIssue(
+                line_number=i,
+                column=max_length,
+                severity='info',
+                category='style',
+                message=f'Line too long ({len(line)} > {max_length} characters)',
+                rule_id='line_too_long',
+                suggestion='Break long line into multiple lines'
+            )
+            for i, line in enumerate(lines, 1)
+            if len(line) > max_length
+        ]
     
-    def _check_complexity(self, content: str, language: str) -> List[CodeIssue]:
+    def _check_complexity(self, tree: Optional[ast.AST]) -> List[CodeIssue]:
         """Check cyclomatic complexity"""
         issues = []
         
-        if language == 'python':
-            try:
-                tree = ast.parse(content)
-                complexity_visitor = ComplexityVisitor()
-                complexity_visitor.visit(tree)
-                
-                for func_name, complexity, line_no in complexity_visitor.complexities:
-                    if complexity > 10:
-                        issues.append(CodeIssue(
-                            line_number=line_no,
-                            column=0,
-                            severity='warning',
-                            category='maintainability',
-                            message=f'Function "{func_name}" has high complexity ({complexity})',
-                            rule_id='high_complexity',
-                            suggestion='Consider breaking this function into smaller functions'
-                        ))
-            except SyntaxError:
-                pass  # Skip if syntax error
+        if tree is None:
+            return issues  # Not Python, or syntax error
+        
+        complexity_visitor = ComplexityVisitor()
+        complexity_visitor.visit(tree)
+        
+        for func_name, complexity, line_no in complexity_visitor.complexities:
+            if complexity > 10:
+                issues.append(CodeIssue(
+                    line_number=line_no,
+                    column=0,
+                    severity='warning',
+                    category='maintainability',
+                    message=f'Function "{func_name}" has high complexity ({complexity})',
+                    rule_id='high_complexity',
+                    suggestion='Consider breaking this function into smaller functions'
+                ))
         
         return issues
     
-    def _analyze_python_structure(self, content: str) -> List[CodeIssue]:
-        """Analyze Python-specific structure"""
-        issues = []
+    def _analyze_python_tree(
+        self,
+        tree: Optional[ast.AST],
+        lines: List[str]
+    ) -> Tuple[List[CodeIssue], Dict[str, Any]]:
+        """Check Python structure and collect metrics in a single AST walk"""
+        docstring_issues = []
+        argument_issues = []
+        metrics = {
+            'lines_of_code': len(lines),
+            'functions': 0,
+            'classes': 0,
+            'imports': 0
+        }
+        
+        if tree is None:
+            return [], metrics
         
-        try:
-            tree = ast.parse(content)
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                metrics['imports'] += 1
+                continue
+            
+            if not isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+                continue
             
             # Check for missing docstrings
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                    if not ast.get_docstring(node):
-                        issues.append(CodeIssue(
-                            line_number=node.lineno,
-                            column=node.col_offset,
-                            severity='info',
-                            category='documentation',
-                            message=f'{type(node).__name__} "{node.name}" missing docstring',
-                            rule_id='missing_docstring',
-                            suggestion='Add docstring to describe the purpose and parameters'
-                        ))
+            if not ast.get_docstring(node):
+                docstring_issues.append(CodeIssue(
+                    line_number=node.lineno,
+                    column=node.col_offset,
+                    severity='info',
+                    category='documentation',
+                    message=f'{type(node).__name__} "{node.name}" missing docstring',
+                    rule_id='missing_docstring',
+                    suggestion='Add docstring to describe the purpose and parameters'
+                ))
+            
+            if isinstance(node, ast.ClassDef):
+                metrics['classes'] += 1
+                continue
+            
+            metrics['functions'] += 1
             
             # Check for too many arguments
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    arg_count = len(node.args.args)
-                    if arg_count > 5:
-                        issues.append(CodeIssue(
-                            line_number=node.lineno,
-                            column=node.col_offset,
-                            severity='warning',
-                            category='maintainability',
-                            message=f'Function "{node.name}" has too many arguments ({arg_count})',
-                            rule_id='too_many_arguments',
-                            suggestion='Consider using a configuration object or reducing parameters'
-                        ))
-        
-        except SyntaxError:
-            issues.append(CodeIssue(
-                line_number=1,
-                column=0,
-                severity='error',
-                category='syntax',
-                message='Syntax error in Python code',
-                rule_id='syntax_error'
-            ))
+            arg_count = len(node.args.args)
+            if arg_count > 5:
+                argument_issues.append(CodeIssue(
+                    line_number=node.lineno,
+                    column=node.col_offset,
+                    severity='warning',
+                    category='maintainability',
+                    message=f'Function "{node.name}" has too many arguments ({arg_count})',
+                    rule_id='too_many_arguments',
+                    suggestion='Consider using a configuration object or reducing parameters'
+                ))
         
-        return issues
+        return docstring_issues + argument_issues, metrics
     
-    def _analyze_js_structure(self, content: str) -> List[CodeIssue]:
+    def _analyze_js_structure(self, lines: List[str]) -> List[CodeIssue]:
         """Analyze JavaScript/TypeScript structure"""
         issues = []
-        lines = content.split('\n')
         
         # Check for var usage (should use let/const)
         for i, line in enumerate(lines, 1):
-            if re.search(r'\bvar\s+', line):
+            if VAR_DECLARATION.search(line):
                 issues.append(CodeIssue(
                     line_number=i,
                     column=line.find('var'),
@@ -253,31 +345,6 @@ class StructureAnalyzer(BaseAnalyzer):
                 ))
         
         return issues
-    
-    def _get_python_metrics(self, content: str) -> Dict[str, Any]:
-        """Get Python code metrics"""
-        metrics = {
-            'lines_of_code': len(content.split('\n')),
-            'functions': 0,
-            'classes': 0,
-            'imports': 0
-        }
-        
-        try:
-            tree = ast.parse(content)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    metrics['functions'] += 1
-                elif isinstance(node, ast.ClassDef):
-                    metrics['classes'] += 1
-                elif isinstance(node, (ast.Import, ast.ImportFrom)):
-                    metrics['imports'] += 1
-        
-        except SyntaxError:
-            pass
-        
-        return metrics
 
 
 class ComplexityVisitor(ast.NodeVisitor):
@@ -358,16 +425,8 @@ class SecurityAnalyzer(BaseAnalyzer):
         issues = []
         lines = content.split('\n')
         
-        # Patterns for common secrets
-        patterns = [
-            (r'password\s*=\s*["\'][^"\']+["\']', 'hardcoded_password'),
-            (r'api_key\s*=\s*["\'][^"\']+["\']', 'hardcoded_api_key'),
-            (r'secret\s*=\s*["\'][^"\']+["\']', 'hardcoded_secret'),
-            (r'token\s*=\s*["\'][^"\']+["\']', 'hardcoded_token'),
-        ]
-        
         for i, line in enumerate(lines, 1):
-            for pattern, rule_id in patterns:
+            for pattern, rule_id in SECRET_PATTERNS:
                 if re.search(pattern, line, re.IGNORECASE):
                     issues.append(CodeIssue(
                         line_number=i,
@@ -386,16 +445,8 @@ class SecurityAnalyzer(BaseAnalyzer):
         issues = []
         lines = content.split('\n')
         
-        # Simple pattern matching for string concatenation in SQL
-        sql_patterns = [
-            r'SELECT.*\+.*',
-            r'INSERT.*\+.*',
-            r'UPDATE.*\+.*',
-            r'DELETE.*\+.*',
-        ]
-        
         for i, line in enumerate(lines, 1):
-            for pattern in sql_patterns:
+            for pattern in SQL_INJECTION_PATTERNS:
                 if re.search(pattern, line, re.IGNORECASE):
                     issues.append(CodeIssue(
                         line_number=i,
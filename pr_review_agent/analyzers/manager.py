@@ -3,7 +3,10 @@ Code analysis manager that coordinates different analyzers
 """
 from typing import List, Dict, Any, Optional
 import fnmatch
-from .base import BaseAnalyzer, AnalysisResult, StructureAnalyzer, SecurityAnalyzer, PerformanceAnalyzer
+from .base import (
+    BaseAnalyzer, AnalysisResult, AnalyzerContext,
+    StructureAnalyzer, SecurityAnalyzer, PerformanceAnalyzer
+)
 
 
 class AnalysisManager:
@@ -53,10 +56,13 @@ class AnalysisManager:
         
         results = []
         
+        # Shared across analyzers; Python sources are parsed at most once, on first use
+        context = AnalyzerContext(file_path, content)
+        
         for analyzer in self.analyzers:
             if analyzer.can_analyze(file_path):
                 try:
-                    result = analyzer.analyze(file_path, content)
+                    result = analyzer.analyze_context(context)
                     results.append(result)
                 except Exception as e:
                     print(f"Error analyzing {file_path} with {type(analyzer).__name__}: {e}")
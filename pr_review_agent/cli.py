@@ -2,6 +2,7 @@
 Command-line interface for PR Review Agent
 """
 import click
+import dataclasses
 import json
 import os
 import sys
@@ -366,7 +367,11 @@ def _save_results_to_file(result: Dict[str, Any], filename: str):
 
 def _make_json_serializable(obj):
     """Convert objects to JSON-serializable format"""
-    if hasattr(obj, '__dict__'):
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        # Slotted dataclasses have no __dict__
+        return {field.name: _make_json_serializable(getattr(obj, field.name))
+                for field in dataclasses.fields(obj)}
+    elif hasattr(obj, '__dict__'):
         return {key: _make_json_serializable(value) for key, value in obj.__dict__.items()}
     elif isinstance(obj, dict):
         return {key: _make_json_serializable(value) for key, value in obj.items()}
@@ -2,12 +2,18 @@
 Configuration management for PR Review Agent
 """
 import os
+import json
+import pickle
 import yaml
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, field
 from pathlib import Path
 
 
+# Parsed YAML is cached next to the config file as JSON, which loads much faster
+CACHE_SUFFIX = '.cache.json'
+
+
 @dataclass
 class ServerConfig:
     """Configuration for a specific git server"""
@@ -107,8 +113,7 @@ class Config:
             return
         
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config_data = yaml.safe_load(f)
+            config_data = self._read_config_data()
             
             if not config_data:
                 self.create_default_config()
@@ -123,6 +128,57 @@ class Config:
             print(f"Error loading config: {e}")
             self.create_default_config()
     
+    def _read_config_data(self) -> Any:
+        """Read raw config data, using the JSON cache while the YAML file is unchanged"""
+        cache_path = f"{self.config_path}{CACHE_SUFFIX}"
+        stat = os.stat(self.config_path)
+        source = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+        
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached['source'] == source:
+                return cached['data']
+        except (OSError, ValueError, TypeError, KeyError):
+            pass  # Missing, stale or corrupt cache
+        
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            config_data = yaml.safe_load(f)
+        
+        self._write_cache(cache_path, source, config_data, stat.st_mode & 0o777)
+        return config_data
+    
+    def _write_cache(self, cache_path: str, source: Dict[str, int], config_data: Any, mode: int):
+        """Write the JSON cache; failures are ignored since caching is optional
+        
+        The cache holds the same secrets as the YAML file (server tokens, API keys),
+        so it is created with the source file's permission bits.
+        """
+        try:
+            payload = json.dumps({'source': source, 'data': config_data})
+        except (TypeError, ValueError):
+            return
+        
+        # Skip YAML values JSON cannot represent faithfully (dates, non-string keys)
+        if json.loads(payload)['data'] != config_data:
+            return
+        
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            # O_EXCL so a leftover temp file cannot pass on looser permissions
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+            with open(fd, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            # e.g. read-only config directory; never leave a partial temp file behind
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+    
     def _load_servers(self, servers_data: Dict[str, Any]):
         """Load server configurations"""
         for name, server_data in servers_data.items():
@@ -225,6 +281,17 @@ class Config:
         print(f"Created default configuration at: {self.config_path}")
         print("Please update the configuration with your API tokens.")
     
+    def to_cache(self) -> bytes:
+        """Serialize the loaded configuration so it can be rebuilt without YAML"""
+        return pickle.dumps(self.__dict__, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    @classmethod
+    def from_cache(cls, data: bytes) -> 'Config':
+        """Rebuild a configuration from to_cache() output (trusted data only)"""
+        config = cls.__new__(cls)
+        config.__dict__.update(pickle.loads(data))
+        return config
+    
     def get_server_config(self, server_name: str) -> Optional[ServerConfig]:
         """Get configuration for a specific server"""
         return self.servers.get(server_name)
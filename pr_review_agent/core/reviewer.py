@@ -20,6 +20,7 @@ class PRReviewer:
         self.analysis_manager = AnalysisManager(self.config.analysis.__dict__)
         self.feedback_manager = FeedbackManager(self.config.ai.__dict__)
         self.scorer = PRScorer(self.config.scoring.__dict__)
+        self._adapters: Dict[str, GitServerAdapter] = {}
         self.logger = self._setup_logging()
     
     def _setup_logging(self):
@@ -184,17 +185,22 @@ class PRReviewer:
         return AdapterFactory.get_supported_servers()
     
     def _get_server_adapter(self, server_name: str) -> GitServerAdapter:
-        """Get server adapter instance"""
+        """Get server adapter instance, creating it on first use"""
+        if server_name in self._adapters:
+            return self._adapters[server_name]
+        
         server_config = self.config.get_server_config(server_name)
         if not server_config:
             raise ValueError(f"No configuration found for server: {server_name}")
         
-        return AdapterFactory.create_adapter(
+        adapter = AdapterFactory.create_adapter(
             server_config.type,
             server_config.base_url,
             server_config.token,
             timeout=server_config.timeout
         )
+        self._adapters[server_name] = adapter
+        return adapter
     
     def _analyze_code(self, file_changes: List[Any]) -> Dict[str, List[Any]]:
         """Analyze code in file changes"""
@@ -320,6 +326,9 @@ class PRReviewer:
             self.config.add_server(name, server_config)
             self.config.save_config()
             
+            # Drop any adapter built from the previous configuration
+            self._adapters.pop(name, None)
+            
             self.logger.info(f"Added server configuration: {name}")
             return True
             
@@ -20,7 +20,7 @@ def main():
     print("📦 Installing test dependencies...")
     subprocess.run([
         sys.executable, "-m", "pip", "install", 
-        "pytest", "pytest-cov", "responses"
+        "pytest", "pytest-cov", "pytest-xdist", "responses"
     ], check=False)
     
     # Run tests with coverage
@@ -29,6 +29,9 @@ def main():
         sys.executable, "-m", "pytest",
         "tests/",
         "-v",
+        "-n", "auto",
+        "--dist", "loadfile",
+        "-m", "slow or not slow",
         "--cov=pr_review_agent",
         "--cov-report=term-missing",
         "--cov-report=html:htmlcov",
@@ -4,10 +4,39 @@ Integration tests for the complete PR review workflow
 import pytest
 import os
 import tempfile
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 from pr_review_agent.core.reviewer import PRReviewer
 
 
+# Test files with various issues
+_GOOD_CODE = '''
+def hello_world():
+    """Print hello world message."""
+    print("Hello, World!")
+    return True
+'''
+
+_BAD_CODE = '''
+def bad_function():
+    password = "PLACEHOLDER_PWD"
+    x = eval(user_input)
+    result = ""
+    for i in range(1000):
+        result += str(i) + ", "
+    return result
+'''
+
+
+@pytest.fixture(scope="module")
+def sample_files():
+    """Good and bad Python sources for the analysis workflow"""
+    return {
+        'good_code.py': _GOOD_CODE,
+        'bad_code.py': _BAD_CODE
+    }
+
+
 class TestPRReviewerIntegration:
     """Integration tests for PR Reviewer"""
     
@@ -51,11 +80,14 @@ scoring:
     
     def teardown_method(self):
         """Clean up test fixtures"""
-        os.unlink(self.config_file.name)
+        from pr_review_agent.core.config import CACHE_SUFFIX
+        
+        for path in (self.config_file.name, self.config_file.name + CACHE_SUFFIX):
+            if os.path.exists(path):
+                os.unlink(path)
     
     @patch('pr_review_agent.adapters.github.Github')
-    @patch('pr_review_agent.core.ai_feedback.openai.OpenAI')
-    def test_complete_review_workflow(self, mock_openai, mock_github):
+    def test_complete_review_workflow(self, mock_github):
         """Test complete PR review workflow"""
         # Mock GitHub API
         mock_pr = Mock()
@@ -75,12 +107,13 @@ scoring:
         mock_pr.commits = 3
         mock_pr.get_files.return_value = []
         
-        mock_file = Mock()
-        mock_file.filename = "test.py"
-        mock_file.status = "modified"
-        mock_file.additions = 20
-        mock_file.deletions = 5
-        mock_file.patch = "@@ -1,5 +1,5 @@\n def test():\n-    pass\n+    return True"
+        mock_file = SimpleNamespace(
+            filename="test.py",
+            status="modified",
+            additions=20,
+            deletions=5,
+            patch="@@ -1,5 +1,5 @@\n def test():\n-    pass\n+    return True"
+        )
         
         mock_repo = Mock()
         mock_repo.get_pull.return_value = mock_pr
@@ -91,20 +124,7 @@ scoring:
         mock_github_instance.get_user.return_value = Mock()
         mock_github.return_value = mock_github_instance
         
-        # Mock OpenAI API
-        mock_openai_client = Mock()
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = '''
-        {
-            "summary": "Good code quality with minor improvements needed",
-            "suggestions": ["Add error handling", "Include more tests"],
-            "overall_assessment": "The code is well-structured but could benefit from additional testing.",
-            "recommendation": "comment"
-        }
-        '''
-        mock_openai_client.chat.completions.create.return_value = mock_response
-        mock_openai.return_value = mock_openai_client
+        # OpenAI is mocked session-wide by the mock_openai fixture in conftest.py
         
         # Create reviewer and test
         reviewer = PRReviewer(self.config_file.name)
@@ -120,16 +140,12 @@ scoring:
                 )]
             }
             
-            with patch.object(reviewer._get_server_adapter('test_github'), 'get_pr_files') as mock_get_files:
-                mock_get_files.return_value = [mock_file]
-                
-                with patch.object(reviewer._get_server_adapter('test_github'), 'post_review') as mock_post:
-                    mock_post.return_value = True
-                    
-                    with patch.object(reviewer._get_server_adapter('test_github'), 'update_pr_status') as mock_status:
-                        mock_status.return_value = True
-                        
-                        result = reviewer.review_pr("test_github", "test/repo", 1)
+            adapter = reviewer._get_server_adapter('test_github')
+            
+            with patch.object(adapter, 'get_pr_files', return_value=[mock_file]), \
+                 patch.object(adapter, 'post_review', return_value=True) as mock_post, \
+                 patch.object(adapter, 'update_pr_status', return_value=True):
+                result = reviewer.review_pr("test_github", "test/repo", 1)
         
         # Verify result
         assert result['success'] is True
@@ -137,31 +153,13 @@ scoring:
         assert 'score_breakdown' in result
         assert 'ai_feedback' in result
         assert result['posted'] is True
+        mock_post.assert_called_once()
     
-    def test_analyze_files_workflow(self):
+    def test_analyze_files_workflow(self, sample_files):
         """Test file analysis workflow"""
         reviewer = PRReviewer(self.config_file.name)
         
-        # Test files with various issues
-        test_files = {
-            'good_code.py': '''
-def hello_world():
-    """Print hello world message."""
-    print("Hello, World!")
-    return True
-''',
-            'bad_code.py': '''
-def bad_function():
-    password = "PLACEHOLDER_PWD"
-    x = eval(user_input)
-    result = ""
-    for i in range(1000):
-        result += str(i) + ", "
-    return result
-'''
-        }
-        
-        result = reviewer.analyze_files(test_files)
+        result = reviewer.analyze_files(sample_files)
         
         assert result['success'] is True
         assert 'analysis_results' in result
@@ -259,36 +257,71 @@ def bad_function():
 class TestConfigurationIntegration:
     """Integration tests for configuration system"""
     
-    def test_config_creation_and_loading(self):
+    def test_config_creation_and_loading(self, default_config_blob):
         """Test configuration file creation and loading"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            config_path = f.name
+        from pr_review_agent.core.config import Config
+        config = Config.from_cache(default_config_blob)
         
-        try:
-            # This should create a default config
-            from pr_review_agent.core.config import Config
-            config = Config(config_path)
-            
-            # Verify default servers are present
-            assert 'github' in config.servers
-            assert 'gitlab' in config.servers
-            assert 'bitbucket' in config.servers
-            
-            # Verify analysis config
-            assert len(config.analysis.enabled_analyzers) > 0
-            assert 'python' in config.analysis.languages
-            
-            # Verify AI config
-            assert config.ai.provider == 'openai'
-            assert config.ai.model == 'gpt-4'
-            
-            # Verify scoring config
-            assert len(config.scoring.weights) == 6
-            assert sum(config.scoring.weights.values()) == 1.0
-            
-        finally:
-            os.unlink(config_path)
+        # Verify default servers are present
+        assert 'github' in config.servers
+        assert 'gitlab' in config.servers
+        assert 'bitbucket' in config.servers
+        
+        # Verify analysis config
+        assert len(config.analysis.enabled_analyzers) > 0
+        assert 'python' in config.analysis.languages
+        
+        # Verify AI config
+        assert config.ai.provider == 'openai'
+        assert config.ai.model == 'gpt-4'
+        
+        # Verify scoring config
+        assert len(config.scoring.weights) == 6
+        assert sum(config.scoring.weights.values()) == 1.0
+    
+    def test_config_cache_roundtrip(self, default_config_blob):
+        """Test that a cached configuration is independent of its source"""
+        from pr_review_agent.core.config import Config
+        config = Config.from_cache(default_config_blob)
+        config.ai.model = 'gpt-3.5-turbo'
+        
+        reloaded = Config.from_cache(config.to_cache())
+        assert reloaded.ai.model == 'gpt-3.5-turbo'
+        assert Config.from_cache(default_config_blob).ai.model == 'gpt-4'
     
+    def test_yaml_cache_reused_until_file_changes(self, tmp_path):
+        """Test that parsed YAML is cached as JSON and refreshed on edits"""
+        from pr_review_agent.core.config import Config, CACHE_SUFFIX
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("ai:\n  provider: openai\n  model: gpt-4\n")
+        
+        assert Config(str(config_path)).ai.model == 'gpt-4'
+        assert (tmp_path / ("config.yaml" + CACHE_SUFFIX)).exists()
+        
+        with patch('pr_review_agent.core.config.yaml.safe_load') as mock_load:
+            assert Config(str(config_path)).ai.model == 'gpt-4'
+            mock_load.assert_not_called()
+        
+        config_path.write_text("ai:\n  provider: openai\n  model: gpt-3.5-turbo\n")
+        assert Config(str(config_path)).ai.model == 'gpt-3.5-turbo'
+
+    @pytest.mark.skipif(os.name != 'posix', reason="POSIX permission bits")
+    def test_yaml_cache_keeps_source_permissions(self, tmp_path):
+        """Test that the JSON cache is no more readable than the YAML holding the tokens"""
+        from pr_review_agent.core.config import Config, CACHE_SUFFIX
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(
+            "servers:\n  gh:\n    base_url: https://api.github.com\n"
+            "    token: ghp_secret\n    type: github\n"
+        )
+        config_path.chmod(0o600)
+
+        assert Config(str(config_path)).servers['gh'].token == 'ghp_secret'
+
+        cache_path = tmp_path / ("config.yaml" + CACHE_SUFFIX)
+        assert cache_path.stat().st_mode & 0o777 == 0o600
+        assert [p.name for p in tmp_path.iterdir() if p.suffix == '.tmp'] == []
+
     def test_environment_variable_substitution(self):
         """Test environment variable substitution in config"""
         with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
@@ -305,7 +338,7 @@ servers:
             # Set environment variable
             os.environ['TEST_TOKEN'] = 'test_value'
             
-            from pr_review_agent.core.config import Config
+            from pr_review_agent.core.config import Config, CACHE_SUFFIX
             config = Config(config_path)
             
             # Token should not be substituted automatically (manual process)
@@ -314,6 +347,8 @@ servers:
             
         finally:
             os.unlink(config_path)
+            if os.path.exists(config_path + CACHE_SUFFIX):
+                os.unlink(config_path + CACHE_SUFFIX)
             if 'TEST_TOKEN' in os.environ:
                 del os.environ['TEST_TOKEN']
 
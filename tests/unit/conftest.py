@@ -0,0 +1,111 @@
+"""
+Shared fixtures for unit tests
+"""
+import pytest
+from unittest.mock import Mock
+
+
+@pytest.fixture
+def make_reviewer():
+    """Factory for PRReviewer mocks; keyword arguments set method return values"""
+    from pr_review_agent.core.reviewer import PRReviewer
+
+    def _make(**return_values):
+        reviewer = Mock(spec=PRReviewer)
+        for name, value in return_values.items():
+            getattr(reviewer, name).return_value = value
+        return reviewer
+    
+    return _make
+
+@pytest.fixture(scope="session")
+def runner():
+    """Click test runner shared by the CLI tests"""
+    from click.testing import CliRunner
+
+    return CliRunner()
+
+@pytest.fixture(scope="session")
+def default_config(default_config_blob):
+    """Default configuration shared read-only across tests; do not mutate"""
+    from pr_review_agent.core.config import Config
+
+    return Config.from_cache(default_config_blob)
+
+@pytest.fixture(scope="session")
+def yaml_config_file(tmp_path_factory):
+    """YAML configuration file written once per session; treat as read-only"""
+    config_file = tmp_path_factory.mktemp("cfg") / "c.yaml"
+    config_file.write_text("""
+ai:
+  provider: huggingface
+  model: bigcode/starcoder
+  enable_inline_comments: false
+analysis:
+  enabled_analyzers:
+    - structure
+    - security
+  max_file_size: 2097152
+scoring:
+  weights:
+    security: 0.4
+    performance: 0.3
+    code_quality: 0.2
+    documentation: 0.1
+""")
+    return config_file
+
+@pytest.fixture(scope="session")
+def loaded_yaml_config(yaml_config_file):
+    """Configuration parsed once from yaml_config_file; treat as read-only"""
+    from pr_review_agent.core.config import Config
+
+    return Config(str(yaml_config_file))
+
+@pytest.fixture
+def invalid_yaml_file(tmp_path):
+    """Malformed YAML file; per test because loading it rewrites it with the defaults"""
+    config_file = tmp_path / "bad.yaml"
+    config_file.write_text("invalid: yaml: content:")
+    return config_file
+
+@pytest.fixture(scope="session")
+def cli_mod():
+    """CLI module, imported on first use so collecting other tests stays cheap"""
+    from pr_review_agent import cli
+
+    return cli
+
+@pytest.fixture(scope="session")
+def reviewer_config_file(tmp_path_factory):
+    """Configuration file shared by the reviewer tests; treat as read-only"""
+    config_file = tmp_path_factory.mktemp("reviewer") / "config.yaml"
+    config_file.write_text("""
+servers:
+  github:
+    base_url: https://api.github.com
+    token: test_token
+    type: github
+  gitlab:
+    base_url: https://gitlab.com/api
+    token: test_token
+    type: gitlab
+    timeout: 60
+analysis:
+  enabled_analyzers:
+    - structure
+    - security
+  exclude_patterns:
+    - "*.min.js"
+ai:
+  provider: openai
+  api_key: test_key
+""")
+    return config_file
+
+@pytest.fixture
+def reviewer(reviewer_config_file):
+    """Fresh PRReviewer per test, loaded from the shared reviewer_config_file"""
+    from pr_review_agent.core.reviewer import PRReviewer
+
+    return PRReviewer(str(reviewer_config_file))
@@ -3,12 +3,24 @@ Unit tests for git server adapters
 """
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+import pr_review_agent.adapters.github as github_module
 from pr_review_agent.adapters.base import AdapterFactory, PRInfo, FileChange, ReviewComment
 from pr_review_agent.adapters.github import GitHubAdapter
 from pr_review_agent.adapters.gitlab import GitLabAdapter
 from pr_review_agent.adapters.bitbucket import BitbucketAdapter
 
 
+def setup_module(module):
+    """Replace the PyGithub client once for the whole module"""
+    module._original_github = github_module.Github
+    github_module.Github = MagicMock()
+
+
+def teardown_module(module):
+    """Restore the real PyGithub client"""
+    github_module.Github = module._original_github
+
+
 class TestAdapterFactory:
     """Test adapter factory functionality"""
     
@@ -19,32 +31,15 @@ class TestAdapterFactory:
         assert "gitlab" in supported
         assert "bitbucket" in supported
     
-    def test_create_github_adapter(self):
-        """Test creating GitHub adapter"""
-        adapter = AdapterFactory.create_adapter(
-            "github", 
-            "https://api.github.com", 
-            "test_token"
-        )
-        assert isinstance(adapter, GitHubAdapter)
-    
-    def test_create_gitlab_adapter(self):
-        """Test creating GitLab adapter"""
-        adapter = AdapterFactory.create_adapter(
-            "gitlab", 
-            "https://gitlab.com/api", 
-            "test_token"
-        )
-        assert isinstance(adapter, GitLabAdapter)
-    
-    def test_create_bitbucket_adapter(self):
-        """Test creating Bitbucket adapter"""
-        adapter = AdapterFactory.create_adapter(
-            "bitbucket", 
-            "https://api.bitbucket.org", 
-            "test_token"
-        )
-        assert isinstance(adapter, BitbucketAdapter)
+    @pytest.mark.parametrize("server_type,base_url,adapter_cls", [
+        ("github", "https://api.github.com", GitHubAdapter),
+        ("gitlab", "https://gitlab.com/api", GitLabAdapter),
+        ("bitbucket", "https://api.bitbucket.org", BitbucketAdapter),
+    ])
+    def test_create_adapter(self, server_type, base_url, adapter_cls):
+        """Test creating each registered adapter"""
+        adapter = AdapterFactory.create_adapter(server_type, base_url, "test_token")
+        assert isinstance(adapter, adapter_cls)
     
     def test_unsupported_server_type(self):
         """Test error for unsupported server type"""
@@ -61,14 +56,13 @@ class TestGitHubAdapter:
     
     def setup_method(self):
         """Set up test fixtures"""
-        with patch('pr_review_agent.adapters.github.Github'):
-            self.adapter = GitHubAdapter(
-                "https://api.github.com", 
-                "test_token"
-            )
+        github_module.Github.reset_mock(return_value=True)
+        self.adapter = GitHubAdapter(
+            "https://api.github.com", 
+            "test_token"
+        )
     
-    @patch('pr_review_agent.adapters.github.Github')
-    def test_get_pr_info(self, mock_github):
+    def test_get_pr_info(self):
         """Test getting PR information"""
         # Mock GitHub API response
         mock_pr = Mock()
@@ -91,9 +85,7 @@ class TestGitHubAdapter:
         mock_repo = Mock()
         mock_repo.get_pull.return_value = mock_pr
         
-        mock_github_instance = Mock()
-        mock_github_instance.get_repo.return_value = mock_repo
-        mock_github.return_value = mock_github_instance
+        github_module.Github.return_value.get_repo.return_value = mock_repo
         
         adapter = GitHubAdapter("https://api.github.com", "test_token")
         pr_info = adapter.get_pr_info("owner/repo", 1)
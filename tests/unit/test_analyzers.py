@@ -2,9 +2,11 @@
 Unit tests for code analyzers
 """
 import pytest
+from unittest.mock import patch
 from pr_review_agent.analyzers.base import (
-    StructureAnalyzer, SecurityAnalyzer, PerformanceAnalyzer, CodeIssue
+    StructureAnalyzer, SecurityAnalyzer, PerformanceAnalyzer, CodeIssue, AnalyzerContext
 )
+from pr_review_agent.analyzers.manager import AnalysisManager
 
 
 class TestStructureAnalyzer:
@@ -14,20 +16,17 @@ class TestStructureAnalyzer:
         """Set up test fixtures"""
         self.analyzer = StructureAnalyzer()
     
-    def test_can_analyze_python_file(self):
-        """Test that analyzer can handle Python files"""
-        assert self.analyzer.can_analyze("test.py")
-        assert self.analyzer.can_analyze("module/test.py")
-    
-    def test_can_analyze_javascript_file(self):
-        """Test that analyzer can handle JavaScript files"""
-        assert self.analyzer.can_analyze("test.js")
-        assert self.analyzer.can_analyze("src/test.ts")
-    
-    def test_cannot_analyze_unsupported_file(self):
-        """Test that analyzer rejects unsupported files"""
-        assert not self.analyzer.can_analyze("test.txt")
-        assert not self.analyzer.can_analyze("image.png")
+    @pytest.mark.parametrize("file_path,expected", [
+        ("test.py", True),
+        ("module/test.py", True),
+        ("test.js", True),
+        ("src/test.ts", True),
+        ("test.txt", False),
+        ("image.png", False),
+    ])
+    def test_can_analyze(self, file_path, expected):
+        """Test which files the analyzer accepts"""
+        assert self.analyzer.can_analyze(file_path) is expected
     
     def test_analyze_python_code(self):
         """Test analysis of Python code"""
@@ -51,6 +50,28 @@ class TestClass:
         assert result.metrics["functions"] == 1
         assert result.metrics["classes"] == 1
     
+    def test_analyze_context_reuses_parsed_tree(self):
+        """Test that a prepared context is not parsed again"""
+        context = AnalyzerContext("test.py", "def test():\n    return 1\n")
+        assert context.tree is not None
+        
+        with patch('pr_review_agent.analyzers.base.ast.parse') as mock_parse:
+            result = self.analyzer.analyze_context(context)
+        
+        mock_parse.assert_not_called()
+        assert result.metrics["functions"] == 1
+    
+    @pytest.mark.parametrize("content", [
+        pytest.param("def broken(:\n", id="syntax_error"),
+        pytest.param("x = 1\0\n", id="null_byte"),
+        pytest.param("x = " + "-" * 200000 + "1\n", id="deep_nesting"),
+    ])
+    def test_unparsable_python_reported_as_syntax_error(self, content):
+        """Test that any parse failure becomes a syntax_error issue instead of raising"""
+        result = self.analyzer.analyze("test.py", content)
+        
+        assert [issue.rule_id for issue in result.issues if issue.category == "syntax"] == ["syntax_error"]
+    
     def test_detect_missing_docstring(self):
         """Test detection of missing docstrings"""
         code = '''
@@ -240,6 +261,46 @@ def efficient_function(items):
         assert len(performance_issues) == 0
 
 
+class TestAnalysisManager:
+    """Test analysis manager coordination"""
+    
+    @pytest.mark.parametrize("file_path,expected", [
+        ("src/app.js", True),
+        ("src/main.py", True),
+        ("static/app.min.js", False),
+        ("node_modules/lib/index.js", False),
+        ("dist/bundle.py", False),
+    ], ids=['js', 'py', 'minified', 'node_modules', 'dist'])
+    def test_should_analyze_file(self, file_path, expected):
+        """Test filtering files by the exclude patterns."""
+        manager = AnalysisManager({'exclude_patterns': ['*.min.js', 'node_modules/*', 'dist/*']})
+        
+        assert manager.should_analyze_file(file_path) is expected
+    
+    def test_unparsable_file_does_not_abort_other_files(self):
+        """Test that a pathological Python file is reported, not raised"""
+        manager = AnalysisManager()
+        files = {
+            "bad.py": "x = " + "-" * 200000 + "1\n",
+            "good.py": "def ok():\n    return 1\n",
+        }
+        
+        results = manager.analyze_files(files)
+        
+        assert set(results) == {"bad.py", "good.py"}
+        assert len(results["bad.py"]) == len(manager.analyzers)
+    
+    def test_text_only_analyzers_skip_parsing(self):
+        """Test that Python sources are not parsed when no analyzer uses the AST"""
+        manager = AnalysisManager({'enabled_analyzers': ['security', 'performance']})
+        
+        with patch('pr_review_agent.analyzers.base.ast.parse') as mock_parse:
+            results = manager.analyze_file("test.py", "def ok():\n    return 1\n")
+        
+        mock_parse.assert_not_called()
+        assert len(results) == 2
+
+
 def test_code_issue_creation():
     """Test CodeIssue dataclass creation"""
     issue = CodeIssue(
@@ -1,329 +1,313 @@
 """Tests for CLI module."""
 
+import click
+import json
 import pytest
-from unittest.mock import patch, Mock, MagicMock
-from click.testing import CliRunner
+from unittest.mock import patch, MagicMock
 
-from pr_review_agent.cli import main, review, analyze, configure, status
-from pr_review_agent.core.config import Config
-from pr_review_agent.adapters.base import ReviewSummary
+
+@pytest.fixture(scope="module")
+def sample_analysis():
+    """Analysis result shared by the CLI tests; treat as read-only"""
+    from pr_review_agent.analyzers.base import AnalysisResult, CodeIssue
+    
+    return AnalysisResult(
+        file_path="test.py",
+        issues=[CodeIssue(
+            line_number=1,
+            column=0,
+            severity="warning",
+            category="documentation",
+            message="Test warning",
+            rule_id="missing_docstring",
+            suggestion="Add docstring"
+        )],
+        metrics={"complexity": 5},
+        language="python"
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_summary():
+    """Review summary shared by the CLI tests; treat as read-only"""
+    from pr_review_agent.adapters.base import ReviewComment, ReviewSummary
+    
+    return ReviewSummary(
+        overall_score=75,
+        comments=[ReviewComment(
+            file_path="test.py",
+            line_number=1,
+            message="Test warning",
+            severity="warning",
+            suggestion="Add docstring",
+            category="documentation"
+        )],
+        summary_message="Good with improvements",
+        recommendation="comment"
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_review_result(sample_summary):
+    """Successful review_pr() result shared by the CLI tests; treat as read-only"""
+    from pr_review_agent.core.ai_feedback import AIFeedback
+    from pr_review_agent.core.scorer import ScoreBreakdown
+    
+    return {
+        'success': True,
+        'score_breakdown': ScoreBreakdown(
+            overall_score=75.0,
+            category_scores={'security': 90.0, 'code_quality': 65.0},
+            metrics={
+                'total_issues': 1,
+                'issues_by_severity': {'error': 0, 'warning': 1, 'info': 0}
+            },
+            grade='B',
+            summary="Good with improvements"
+        ),
+        'ai_feedback': AIFeedback(
+            summary="Good with improvements",
+            suggestions=["Add docstring"],
+            inline_comments=[],
+            overall_assessment="Solid change",
+            recommendation="comment"
+        ),
+        'review_summary': sample_summary,
+        'posted': True
+    }
 
 
 class TestCLI:
     """Test CLI commands."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
+    @pytest.fixture(autouse=True)
+    def get_reviewer_mock(self, monkeypatch):
+        """Replace get_reviewer for every CLI test so no real reviewer is built"""
+        get_reviewer = MagicMock()
+        monkeypatch.setattr('pr_review_agent.cli.get_reviewer', get_reviewer)
+        return get_reviewer
     
-    def test_main_help(self):
+    def test_main_help(self, runner, cli_mod):
         """Test main command help."""
-        result = self.runner.invoke(main, ['--help'])
+        result = runner.invoke(cli_mod.cli, ['--help'])
         
         assert result.exit_code == 0
-        assert 'PR Review Agent' in result.output
+        assert 'Pull Request Review Agent' in result.output
         assert 'review' in result.output
         assert 'analyze' in result.output
         assert 'configure' in result.output
         assert 'status' in result.output
     
-    @patch('pr_review_agent.cli.PRReviewer')
-    @patch('pr_review_agent.cli.ConfigManager.load_from_file')
-    def test_review_command_success(self, mock_load_config, mock_reviewer_class):
+    def test_review_command_success(self, get_reviewer_mock, make_reviewer, runner, sample_review_result, cli_mod):
         """Test successful review command."""
-        # Mock config
-        mock_config = Config(github_token="test_token")
-        mock_load_config.return_value = mock_config
-        
-        # Mock reviewer
-        mock_reviewer = Mock()
-        mock_reviewer_class.return_value = mock_reviewer
-        
-        # Mock review result
-        mock_summary = ReviewSummary(
-            overall_score=85,
-            grade='B',
-            feedback="Good code!",
-            file_analyses={},
-            recommendations=[]
-        )
-        mock_reviewer.review_pr.return_value = mock_summary
+        mock_reviewer = make_reviewer(review_pr=sample_review_result)
+        get_reviewer_mock.return_value = mock_reviewer
         
-        result = self.runner.invoke(review, [
+        result = runner.invoke(cli_mod.cli, [
+            'review',
             '--server', 'github',
             '--repo', 'owner/repo', 
             '--pr', '123'
         ])
         
         assert result.exit_code == 0
-        assert 'Review completed successfully!' in result.output
-        assert 'Overall Score: 85' in result.output
-        assert 'Grade: B' in result.output
+        assert 'Grade: B (75.0/100)' in result.output
+        assert 'Total Issues: 1' in result.output
         
-        mock_reviewer.review_pr.assert_called_once_with('github', 'owner/repo', 123)
+        mock_reviewer.review_pr.assert_called_once_with('github', 'owner/repo', 123, post_review=True)
     
-    @patch('pr_review_agent.cli.PRReviewer')
-    @patch('pr_review_agent.cli.ConfigManager.load_from_file')
-    def test_review_command_missing_repo(self, mock_load_config, mock_reviewer_class):
+    def test_review_command_missing_repo(self, cli_mod):
         """Test review command with missing repo parameter."""
-        result = self.runner.invoke(review, [
-            '--server', 'github',
-            '--pr', '123'
-        ])
+        with pytest.raises(click.UsageError) as excinfo:
+            cli_mod.review.make_context('review', [
+                '--server', 'github',
+                '--pr', '123'
+            ])
         
-        assert result.exit_code != 0
-        assert 'Missing option' in result.output or 'Usage:' in result.output
+        assert 'Missing option' in excinfo.value.format_message()
     
-    @patch('pr_review_agent.cli.PRReviewer')
-    @patch('pr_review_agent.cli.ConfigManager.load_from_file')
-    def test_review_command_error(self, mock_load_config, mock_reviewer_class):
+    def test_review_command_error(self, get_reviewer_mock, make_reviewer, runner, cli_mod):
         """Test review command with error."""
-        # Mock config
-        mock_config = Config(github_token="test_token")
-        mock_load_config.return_value = mock_config
-        
-        # Mock reviewer with error
-        mock_reviewer = Mock()
-        mock_reviewer_class.return_value = mock_reviewer
-        mock_reviewer.review_pr.side_effect = Exception("API Error")
+        reviewer_mock = make_reviewer()
+        get_reviewer_mock.return_value = reviewer_mock
+        reviewer_mock.review_pr.side_effect = Exception("API Error")
         
-        result = self.runner.invoke(review, [
+        result = runner.invoke(cli_mod.cli, [
+            'review',
             '--server', 'github',
             '--repo', 'owner/repo',
             '--pr', '123'
         ])
         
         assert result.exit_code != 0
-        assert 'Error during review' in result.output
+        assert 'Unexpected error' in result.output
         assert 'API Error' in result.output
     
-    @patch('pr_review_agent.cli.PRReviewer')
-    @patch('pr_review_agent.cli.ConfigManager.load_from_file') 
-    def test_analyze_command_success(self, mock_load_config, mock_reviewer_class):
+    def test_analyze_command_success(self, get_reviewer_mock, make_reviewer, runner, sample_analysis, tmp_path, cli_mod):
         """Test successful analyze command."""
-        # Mock config
-        mock_config = Config()
-        mock_load_config.return_value = mock_config
+        from pr_review_agent.analyzers.manager import AnalysisManager
         
-        # Mock reviewer
-        mock_reviewer = Mock()
-        mock_reviewer_class.return_value = mock_reviewer
+        analysis_results = {'test.py': [sample_analysis]}
+        reviewer_mock = make_reviewer(analyze_files={
+            'success': True,
+            'analysis_results': analysis_results,
+            'summary_metrics': AnalysisManager().get_summary_metrics(analysis_results)
+        })
+        get_reviewer_mock.return_value = reviewer_mock
         
-        # Mock analysis result
-        from pr_review_agent.analyzers.base import AnalysisResult
-        mock_result = AnalysisResult(
-            file_path="test.py",
-            issues=[],
-            metrics={'complexity': 1},
-            suggestions=[]
-        )
-        mock_reviewer.analysis_manager.analyze_file.return_value = mock_result
+        test_file = tmp_path / "test.py"
+        test_file.write_text('def test(): pass')
+        
+        result = runner.invoke(cli_mod.cli, ['analyze', str(test_file)])
         
-        # Create a temporary file
-        with self.runner.isolated_filesystem():
-            with open('test.py', 'w') as f:
-                f.write('def test(): pass')
-            
-            result = self.runner.invoke(analyze, ['--files', 'test.py'])
-            
-            assert result.exit_code == 0
-            assert 'Analysis completed' in result.output
-            assert 'test.py' in result.output
+        assert result.exit_code == 0
+        assert 'Files Analyzed: 1' in result.output
+        assert 'Total Issues: 1' in result.output
+        reviewer_mock.analyze_files.assert_called_once_with({str(test_file): 'def test(): pass'})
     
-    def test_analyze_command_missing_files(self):
+    def test_analyze_command_missing_files(self, cli_mod):
         """Test analyze command with missing files parameter."""
-        result = self.runner.invoke(analyze, [])
-        
-        assert result.exit_code != 0
-        assert 'Missing option' in result.output or 'Usage:' in result.output
+        with pytest.raises(click.UsageError):
+            cli_mod.analyze.make_context('analyze', [])
     
-    @patch('pr_review_agent.cli.ConfigManager.load_from_file')
-    def test_analyze_command_file_not_found(self, mock_load_config):
+    def test_analyze_command_file_not_found(self, runner, tmp_path, cli_mod):
         """Test analyze command with non-existent file."""
-        mock_config = Config()
-        mock_load_config.return_value = mock_config
-        
-        result = self.runner.invoke(analyze, ['--files', 'nonexistent.py'])
+        result = runner.invoke(cli_mod.cli, ['analyze', str(tmp_path / 'nonexistent.py')])
         
         assert result.exit_code != 0
         assert 'not found' in result.output.lower()
+        assert 'No valid files to analyze' in result.output
     
-    @patch('pr_review_agent.cli.ConfigManager.load_from_file')
-    @patch('pr_review_agent.cli.ConfigManager.save_to_file')
-    def test_configure_command_success(self, mock_save_config, mock_load_config):
+    def test_configure_command_success(self, get_reviewer_mock, make_reviewer, runner, cli_mod):
         """Test successful configure command."""
-        # Mock existing config
-        mock_config = Config()
-        mock_load_config.return_value = mock_config
-        
-        result = self.runner.invoke(configure, [
-            '--github-token', 'new_github_token',
-            '--openai-key', 'new_openai_key',
-            '--ai-provider', 'huggingface'
+        reviewer_mock = make_reviewer(
+            configure_server=True,
+            get_server_status={'server_name': 'gh', 'connected': True}
+        )
+        get_reviewer_mock.return_value = reviewer_mock
+        
+        result = runner.invoke(cli_mod.cli, [
+            'configure',
+            '--name', 'gh',
+            '--type', 'github',
+            '--url', 'https://api.github.com',
+            '--token', 'new_github_token'
         ])
         
         assert result.exit_code == 0
-        assert 'Configuration updated successfully' in result.output
-        
-        # Verify save was called
-        mock_save_config.assert_called_once()
-        saved_config = mock_save_config.call_args[0][0]
-        assert saved_config.github_token == 'new_github_token'
-        assert saved_config.openai_api_key == 'new_openai_key'
-        assert saved_config.ai_provider == 'huggingface'
+        assert "Server 'gh' configured successfully" in result.output
+        assert 'Connection test successful' in result.output
+        reviewer_mock.configure_server.assert_called_once_with(
+            'gh', 'github', 'https://api.github.com', 'new_github_token'
+        )
     
-    @patch('pr_review_agent.cli.ConfigManager.load_from_file')
-    @patch('builtins.input')
-    def test_configure_command_interactive(self, mock_input, mock_load_config):
-        """Test interactive configure command."""
-        # Mock existing config
-        mock_config = Config()
-        mock_load_config.return_value = mock_config
-        
-        # Mock user inputs
-        mock_input.side_effect = [
-            'new_github_token',  # GitHub token
-            'new_openai_key',    # OpenAI key
-            'huggingface',       # AI provider
-            'y'                  # Save confirmation
-        ]
+    def test_configure_command_failure(self, get_reviewer_mock, make_reviewer, runner, cli_mod):
+        """Test configure command when the server cannot be saved."""
+        get_reviewer_mock.return_value = make_reviewer(configure_server=False)
+        
+        result = runner.invoke(cli_mod.cli, [
+            'configure',
+            '--name', 'gh',
+            '--type', 'github',
+            '--url', 'https://api.github.com',
+            '--token', 'new_github_token'
+        ])
         
-        with patch('pr_review_agent.cli.ConfigManager.save_to_file') as mock_save:
-            result = self.runner.invoke(configure, ['--interactive'])
-            
-            assert result.exit_code == 0
-            assert 'Configuration updated successfully' in result.output
-            mock_save.assert_called_once()
+        assert result.exit_code != 0
+        assert 'Failed to configure server' in result.output
     
-    @patch('pr_review_agent.cli.ConfigManager.load_from_file')
-    def test_status_command_success(self, mock_load_config):
+    def test_status_command_success(self, runner, tmp_path, cli_mod):
         """Test successful status command."""
-        # Mock config with some values
-        mock_config = Config(
-            github_token="gh_token",
-            openai_api_key="openai_key",
-            ai_provider="openai"
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            "servers:\n  gh:\n    base_url: https://api.github.com\n"
+            "    token: gh_token\n    type: github\n"
         )
-        mock_load_config.return_value = mock_config
         
-        result = self.runner.invoke(status)
+        result = runner.invoke(cli_mod.cli, ['--config', str(config_file), 'status'])
         
         assert result.exit_code == 0
-        assert 'System Status' in result.output
-        assert 'GitHub Token: ✓ Configured' in result.output
-        assert 'OpenAI API Key: ✓ Configured' in result.output
-        assert 'AI Provider: openai' in result.output
+        assert 'Server Status' in result.output
+        assert 'gh' in result.output
+        assert 'Configured' in result.output
     
-    @patch('pr_review_agent.cli.ConfigManager.load_from_file')
-    def test_status_command_missing_config(self, mock_load_config):
+    def test_status_command_missing_config(self, runner, tmp_path, cli_mod):
         """Test status command with missing configuration."""
-        # Mock config with missing values
-        mock_config = Config()  # Default empty config
-        mock_load_config.return_value = mock_config
+        config_file = tmp_path / "config.yaml"
         
-        result = self.runner.invoke(status)
+        result = runner.invoke(cli_mod.cli, ['--config', str(config_file), 'status'])
         
         assert result.exit_code == 0
-        assert 'System Status' in result.output
-        assert 'GitHub Token: ✗ Not configured' in result.output
-        assert 'OpenAI API Key: ✗ Not configured' in result.output
+        assert 'No servers configured' in result.output
+        assert 'Not configured' in result.output
     
-    @patch('pr_review_agent.cli.ConfigManager.load_from_file')
-    def test_config_loading_error(self, mock_load_config):
+    def test_config_loading_error(self, runner, cli_mod):
         """Test CLI handles config loading errors gracefully."""
-        mock_load_config.side_effect = Exception("Config error")
+        with patch('pr_review_agent.cli.Config', side_effect=Exception("Config error")):
+            result = runner.invoke(cli_mod.cli, ['status'])
         
-        result = self.runner.invoke(status)
-        
-        assert result.exit_code != 0
-        assert 'Error loading configuration' in result.output
+        assert result.exit_code == 0
+        assert 'Error checking status: Config error' in result.output
     
-    def test_invalid_server_option(self):
+    def test_invalid_server_option(self, get_reviewer_mock, make_reviewer, runner, cli_mod):
         """Test review command with invalid server option."""
-        result = self.runner.invoke(review, [
+        # The server name is only checked against the configuration at runtime
+        get_reviewer_mock.return_value = make_reviewer(review_pr={
+            'success': False,
+            'error': 'No configuration found for server: invalid_server'
+        })
+        
+        result = runner.invoke(cli_mod.cli, [
+            'review',
             '--server', 'invalid_server',
             '--repo', 'owner/repo',
             '--pr', '123'
         ])
         
         assert result.exit_code != 0
-        assert 'Invalid value' in result.output or 'not supported' in result.output.lower()
+        assert 'No configuration found for server: invalid_server' in result.output
     
-    def test_invalid_pr_number(self):
+    def test_invalid_pr_number(self, cli_mod):
         """Test review command with invalid PR number."""
-        result = self.runner.invoke(review, [
-            '--server', 'github',
-            '--repo', 'owner/repo',
-            '--pr', 'invalid'
-        ])
-        
-        assert result.exit_code != 0
-        assert 'Invalid value' in result.output
+        with pytest.raises(click.BadParameter, match="'invalid' is not a valid integer") as excinfo:
+            cli_mod.review.make_context('review', [
+                '--server', 'github',
+                '--repo', 'owner/repo',
+                '--pr', 'invalid'
+            ])
+        
+        assert 'Invalid value' in excinfo.value.format_message()
     
-    @patch('pr_review_agent.cli.PRReviewer')
-    @patch('pr_review_agent.cli.ConfigManager.load_from_file')
-    def test_review_with_config_file(self, mock_load_config, mock_reviewer_class):
+    def test_review_with_config_file(self, get_reviewer_mock, make_reviewer, runner, sample_review_result, cli_mod):
         """Test review command with custom config file."""
-        mock_config = Config(github_token="test_token")
-        mock_load_config.return_value = mock_config
-        
-        mock_reviewer = Mock()
-        mock_reviewer_class.return_value = mock_reviewer
-        mock_reviewer.review_pr.return_value = Mock(
-            overall_score=90,
-            grade='A',
-            feedback="Excellent!",
-            file_analyses={},
-            recommendations=[]
-        )
+        get_reviewer_mock.return_value = make_reviewer(review_pr=sample_review_result)
         
-        result = self.runner.invoke(review, [
+        result = runner.invoke(cli_mod.cli, [
+            '--config', '/custom/config.yaml',
+            'review',
             '--server', 'github',
             '--repo', 'owner/repo',
-            '--pr', '123',
-            '--config', '/custom/config.yaml'
+            '--pr', '123'
         ])
         
         assert result.exit_code == 0
-        mock_load_config.assert_called_with('/custom/config.yaml')
+        get_reviewer_mock.assert_called_once_with('/custom/config.yaml')
     
-    @patch('pr_review_agent.cli.PRReviewer')
-    @patch('pr_review_agent.cli.ConfigManager.load_from_file')
-    def test_review_verbose_output(self, mock_load_config, mock_reviewer_class):
-        """Test review command with verbose output."""
-        mock_config = Config(github_token="test_token")
-        mock_load_config.return_value = mock_config
-        
-        mock_reviewer = Mock()
-        mock_reviewer_class.return_value = mock_reviewer
-        
-        # Mock detailed review result
-        from pr_review_agent.analyzers.base import AnalysisResult
-        analysis_result = AnalysisResult(
-            file_path="test.py",
-            issues=[{"type": "warning", "message": "Test warning"}],
-            metrics={"complexity": 5},
-            suggestions=["Add docstring"]
-        )
-        
-        mock_summary = ReviewSummary(
-            overall_score=75,
-            grade='B-',
-            feedback="Good with improvements",
-            file_analyses={"test.py": analysis_result},
-            recommendations=["Reduce complexity"]
-        )
-        mock_reviewer.review_pr.return_value = mock_summary
+    def test_review_output_file(self, get_reviewer_mock, make_reviewer, runner, sample_review_result, tmp_path, cli_mod):
+        """Test review command saving results to a JSON file."""
+        get_reviewer_mock.return_value = make_reviewer(review_pr=sample_review_result)
+        output_file = tmp_path / "review.json"
         
-        result = self.runner.invoke(review, [
+        result = runner.invoke(cli_mod.cli, [
+            'review',
             '--server', 'github',
             '--repo', 'owner/repo',
             '--pr', '123',
-            '--verbose'
+            '--output', str(output_file)
         ])
         
         assert result.exit_code == 0
-        assert 'File Analysis Details' in result.output
-        assert 'test.py' in result.output
-        assert 'Test warning' in result.output
-        assert 'Add docstring' in result.output
+        saved = json.loads(output_file.read_text())
+        assert saved['score_breakdown']['grade'] == 'B'
+        assert saved['review_summary']['recommendation'] == 'comment'
+        assert saved['review_summary']['comments'][0]['suggestion'] == 'Add docstring'
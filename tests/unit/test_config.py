@@ -1,247 +1,168 @@
 """Tests for core configuration module."""
 
+import operator
 import pytest
-import tempfile
-import os
-from pathlib import Path
-from unittest.mock import patch, mock_open
+from types import MappingProxyType
 
-from pr_review_agent.core.config import Config, ConfigManager
+from pr_review_agent.core.config import Config, ServerConfig
+
+# Environment shared by the API key tests; do not mutate
+_ENV_VARS = MappingProxyType({'OPENAI_API_KEY': 'openai_test_key'})
 
 
 class TestConfig:
-    """Test Config dataclass."""
-    
-    def test_default_config(self):
+    """Test Config defaults."""
+    
+    @pytest.mark.parametrize("attr,expected", [
+        ("ai.provider", "openai"),
+        ("ai.model", "gpt-4"),
+        ("ai.max_tokens", 1500),
+        ("ai.temperature", 0.3),
+        ("ai.enable_suggestions", True),
+        ("ai.enable_inline_comments", True),
+        ("analysis.max_file_size", 1024 * 1024),  # 1MB
+        ("analysis.enabled_analyzers", ["structure", "standards", "security", "performance", "bugs"]),
+        ("scoring.weights", {
+            'code_quality': 0.25,
+            'test_coverage': 0.20,
+            'documentation': 0.15,
+            'security': 0.20,
+            'performance': 0.10,
+            'maintainability': 0.10
+        }),
+        ("scoring.thresholds", {
+            'excellent': 90,
+            'good': 75,
+            'fair': 60,
+            'poor': 40
+        }),
+    ])
+    def test_defaults(self, default_config, attr, expected):
         """Test default configuration values."""
-        config = Config()
-        
-        assert config.github_token == ""
-        assert config.gitlab_token == ""
-        assert config.bitbucket_token == ""
-        assert config.openai_api_key == ""
-        assert config.ai_provider == "openai"
-        assert config.enable_security_analysis is True
-        assert config.enable_performance_analysis is True
-        assert config.enable_structure_analysis is True
-        assert config.max_file_size == 1024 * 1024  # 1MB
-        assert config.supported_extensions == ['.py', '.js', '.ts', '.java', '.cpp', '.c', '.go', '.rs']
-    
-    def test_scoring_weights(self):
-        """Test scoring configuration."""
-        config = Config()
-        
-        expected_weights = {
-            'security': 0.3,
-            'performance': 0.25,
-            'structure': 0.25,
-            'style': 0.2
-        }
-        assert config.scoring_weights == expected_weights
-    
-    def test_scoring_thresholds(self):
-        """Test scoring thresholds."""
-        config = Config()
-        
-        expected_thresholds = {
-            'A+': 95, 'A': 90, 'A-': 85,
-            'B+': 80, 'B': 75, 'B-': 70,
-            'C+': 65, 'C': 60, 'C-': 55,
-            'D': 50, 'F': 0
-        }
-        assert config.scoring_thresholds == expected_thresholds
-    
-    def test_security_rules(self):
-        """Test security rules configuration."""
-        config = Config()
-        
-        assert 'hardcoded_secrets' in config.security_rules
-        assert 'sql_injection' in config.security_rules
-        assert 'xss_vulnerabilities' in config.security_rules
-        assert 'unsafe_deserialization' in config.security_rules
-        assert 'weak_crypto' in config.security_rules
+        value = operator.attrgetter(attr)(default_config)
+        
+        if isinstance(expected, bool):
+            assert value is expected
+        else:
+            assert value == expected
+    
+    def test_exclude_patterns(self, default_config):
+        """Test default exclude patterns."""
+        assert '*.min.js' in default_config.analysis.exclude_patterns
+        assert 'node_modules/*' in default_config.analysis.exclude_patterns
+        assert 'vendor/*' in default_config.analysis.exclude_patterns
+        assert 'dist/*' in default_config.analysis.exclude_patterns
+        assert 'build/*' in default_config.analysis.exclude_patterns
 
 
-class TestConfigManager:
-    """Test ConfigManager class."""
+class TestConfigLoading:
+    """Test loading and saving configuration files."""
     
-    def test_load_from_file_yaml(self):
+    def test_load_from_file_yaml(self, loaded_yaml_config):
         """Test loading configuration from YAML file."""
-        yaml_content = """
-ai_provider: "huggingface"
-max_file_size: 2097152
-enable_security_analysis: false
-scoring_weights:
-  security: 0.4
-  performance: 0.3
-  structure: 0.2
-  style: 0.1
-"""
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            f.write(yaml_content)
-            f.flush()
-            
-            try:
-                config = ConfigManager.load_from_file(f.name)
-                
-                assert config.ai_provider == "huggingface"
-                assert config.max_file_size == 2097152
-                assert config.enable_security_analysis is False
-                assert config.scoring_weights['security'] == 0.4
-                assert config.scoring_weights['performance'] == 0.3
-                
-            finally:
-                os.unlink(f.name)
-    
-    def test_load_from_file_not_found(self):
-        """Test loading from non-existent file returns default config."""
-        config = ConfigManager.load_from_file("/non/existent/file.yaml")
-        
-        # Should return default config
-        assert isinstance(config, Config)
-        assert config.ai_provider == "openai"  # default value
-    
-    def test_load_from_env(self):
-        """Test loading configuration from environment variables."""
-        env_vars = {
-            'GITHUB_TOKEN': 'gh_test_token',
-            'GITLAB_TOKEN': 'gl_test_token',
-            'OPENAI_API_KEY': 'openai_test_key',
-            'AI_PROVIDER': 'huggingface',
-            'ENABLE_SECURITY_ANALYSIS': 'false',
-            'MAX_FILE_SIZE': '512000'
-        }
-        
-        with patch.dict(os.environ, env_vars):
-            config = ConfigManager.load_from_env()
-            
-            assert config.github_token == 'gh_test_token'
-            assert config.gitlab_token == 'gl_test_token'
-            assert config.openai_api_key == 'openai_test_key'
-            assert config.ai_provider == 'huggingface'
-            assert config.enable_security_analysis is False
-            assert config.max_file_size == 512000
-    
-    def test_load_from_env_boolean_conversion(self):
-        """Test boolean environment variable conversion."""
-        test_cases = [
-            ('true', True),
-            ('True', True),
-            ('TRUE', True),
-            ('1', True),
-            ('yes', True),
-            ('false', False),
-            ('False', False),
-            ('FALSE', False),
-            ('0', False),
-            ('no', False),
-            ('', False),
-        ]
-        
-        for env_value, expected in test_cases:
-            with patch.dict(os.environ, {'ENABLE_SECURITY_ANALYSIS': env_value}):
-                config = ConfigManager.load_from_env()
-                assert config.enable_security_analysis is expected
-    
-    def test_merge_configs(self):
-        """Test merging multiple configurations."""
-        base_config = Config(
-            github_token="base_token",
-            ai_provider="openai",
-            max_file_size=1024
-        )
-        
-        override_config = Config(
-            github_token="override_token",
-            gitlab_token="new_gitlab_token",
-            max_file_size=2048
-        )
-        
-        merged = ConfigManager.merge_configs(base_config, override_config)
-        
-        # Overridden values
-        assert merged.github_token == "override_token"
-        assert merged.max_file_size == 2048
-        
-        # New values
-        assert merged.gitlab_token == "new_gitlab_token"
-        
-        # Preserved values
-        assert merged.ai_provider == "openai"
-    
-    def test_validate_config_valid(self):
-        """Test validation of valid configuration."""
-        config = Config(
-            ai_provider="openai",
-            openai_api_key="sk-test123",
-            github_token="gh_test"
+        assert loaded_yaml_config.ai.provider == "huggingface"
+        assert loaded_yaml_config.ai.enable_inline_comments is False
+        assert loaded_yaml_config.analysis.max_file_size == 2097152
+        assert loaded_yaml_config.analysis.enabled_analyzers == ["structure", "security"]
+        assert loaded_yaml_config.scoring.weights['security'] == 0.4
+        assert loaded_yaml_config.scoring.weights['performance'] == 0.3
+    
+    def test_load_from_file_not_found(self, tmp_path):
+        """Test loading from non-existent file writes and uses the defaults."""
+        config_file = tmp_path / "missing" / "config.yaml"
+        
+        config = Config(str(config_file))
+        
+        assert config_file.exists()
+        assert config.ai.provider == "openai"  # default value
+    
+    def test_api_key_from_env(self, tmp_path, monkeypatch):
+        """Test the OpenAI key falls back to the environment."""
+        for name, value in _ENV_VARS.items():
+            monkeypatch.setenv(name, value)
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("ai:\n  provider: openai\n")
+        
+        config = Config(str(config_file))
+        
+        assert config.ai.api_key == _ENV_VARS['OPENAI_API_KEY']
+    
+    def test_api_key_in_file_overrides_env(self, tmp_path, monkeypatch):
+        """Test an explicit API key wins over the environment."""
+        for name, value in _ENV_VARS.items():
+            monkeypatch.setenv(name, value)
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("ai:\n  provider: openai\n  api_key: file_key\n")
+        
+        assert Config(str(config_file)).ai.api_key == 'file_key'
+    
+    @pytest.mark.parametrize("yaml_value,expected", [
+        ('true', True),
+        ('True', True),
+        ('TRUE', True),
+        ('yes', True),
+        ('on', True),
+        ('false', False),
+        ('False', False),
+        ('FALSE', False),
+        ('no', False),
+        ('off', False),
+    ])
+    def test_load_boolean_values(self, tmp_path, yaml_value, expected):
+        """Test YAML boolean spellings load as booleans."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(f"ai:\n  enable_suggestions: {yaml_value}\n")
+        
+        assert Config(str(config_file)).ai.enable_suggestions is expected
+    
+    def test_add_server(self, tmp_path):
+        """Test adding a server configuration."""
+        config = Config(str(tmp_path / "config.yaml"))
+        server = ServerConfig(
+            base_url="https://gitlab.example.com/api",
+            token="gl_test_token",
+            type="gitlab"
         )
         
-        # Should not raise any exception
-        ConfigManager.validate_config(config)
-    
-    def test_validate_config_invalid_ai_provider(self):
-        """Test validation fails for invalid AI provider."""
-        config = Config(ai_provider="invalid_provider")
-        
-        with pytest.raises(ValueError, match="Invalid AI provider"):
-            ConfigManager.validate_config(config)
-    
-    def test_validate_config_missing_openai_key(self):
-        """Test validation fails when OpenAI provider has no API key."""
-        config = Config(
-            ai_provider="openai",
-            openai_api_key=""
-        )
-        
-        with pytest.raises(ValueError, match="OpenAI API key is required"):
-            ConfigManager.validate_config(config)
-    
-    def test_validate_config_missing_git_tokens(self):
-        """Test validation fails when no git server tokens provided."""
-        config = Config(
-            github_token="",
-            gitlab_token="",
-            bitbucket_token=""
-        )
+        config.add_server("gitlab_internal", server)
         
-        with pytest.raises(ValueError, match="At least one git server token"):
-            ConfigManager.validate_config(config)
+        assert config.get_server_config("gitlab_internal") is server
+        assert config.get_server_config("unknown") is None
     
-    def test_save_to_file(self):
+    def test_save_to_file(self, tmp_path):
         """Test saving configuration to file."""
-        config = Config(
-            github_token="test_token",
-            ai_provider="huggingface",
-            max_file_size=2048
-        )
+        config_file = tmp_path / "config.yaml"
+        config = Config(str(config_file))
+        config.ai.provider = "huggingface"
+        config.analysis.max_file_size = 2048
+        config.add_server("github", ServerConfig(
+            base_url="https://api.github.com",
+            token="test_token",
+            type="github"
+        ))
+        
+        config.save_config()
+        
+        # Load it back and verify
+        loaded_config = Config(str(config_file))
+        assert loaded_config.servers["github"].token == "test_token"
+        assert loaded_config.ai.provider == "huggingface"
+        assert loaded_config.analysis.max_file_size == 2048
+    
+    def test_find_config_in_working_directory(self, tmp_path, monkeypatch):
+        """Test the working-directory config file is found first."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "pr_review_config.yaml").write_text("ai:\n  model: gpt-3.5-turbo\n")
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            try:
-                ConfigManager.save_to_file(config, f.name)
-                
-                # Load it back and verify
-                loaded_config = ConfigManager.load_from_file(f.name)
-                assert loaded_config.github_token == "test_token"
-                assert loaded_config.ai_provider == "huggingface"
-                assert loaded_config.max_file_size == 2048
-                
-            finally:
-                os.unlink(f.name)
-    
-    def test_get_default_config_path(self):
-        """Test getting default configuration path."""
-        path = ConfigManager.get_default_config_path()
+        config = Config()
         
-        assert isinstance(path, Path)
-        assert str(path).endswith('pr_review_config.yaml')
+        assert config.config_path == "pr_review_config.yaml"
+        assert config.ai.model == "gpt-3.5-turbo"
     
-    @patch('builtins.open', new_callable=mock_open, read_data="invalid: yaml: content:")
-    def test_load_invalid_yaml(self, mock_file):
+    def test_load_invalid_yaml(self, invalid_yaml_file):
         """Test loading invalid YAML returns default config."""
-        config = ConfigManager.load_from_file("test.yaml")
+        config = Config(str(invalid_yaml_file))
         
         # Should return default config on invalid YAML
         assert isinstance(config, Config)
-        assert config.ai_provider == "openai"  # default value
+        assert config.ai.provider == "openai"  # default value
@@ -1,287 +1,249 @@
 """Tests for core reviewer module."""
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from pathlib import Path
+from datetime import datetime
+from unittest.mock import Mock, patch, create_autospec
 
 from pr_review_agent.core.reviewer import PRReviewer
-from pr_review_agent.core.config import Config
-from pr_review_agent.adapters.base import PRInfo, FileChange, ReviewSummary
-from pr_review_agent.analyzers.base import AnalysisResult
+from pr_review_agent.core.ai_feedback import AIFeedback
+from pr_review_agent.adapters.base import PRInfo, FileChange, ReviewSummary, GitServerAdapter
+from pr_review_agent.analyzers.base import AnalysisResult, CodeIssue
+from pr_review_agent.core.scorer import ScoreBreakdown
+
+# Pull request and AI feedback returned by the mocked collaborators; do not mutate
+_PR_INFO = PRInfo(
+    id='123',
+    number=123,
+    title='Test PR',
+    description='Test description',
+    author='test_user',
+    source_branch='feature',
+    target_branch='main',
+    status='open',
+    created_at=datetime(2024, 1, 1),
+    updated_at=datetime(2024, 1, 1),
+    url='https://github.com/owner/repo/pull/123',
+    repository='owner/repo',
+    files_changed=['test.py'],
+    additions=1,
+    deletions=0,
+    commits=1
+)
+
+_AI_FEEDBACK = AIFeedback(
+    summary="Great code!",
+    suggestions=["Add tests"],
+    inline_comments=[],
+    overall_assessment="Ready to merge",
+    recommendation="approve"
+)
 
 
 class TestPRReviewer:
     """Test PRReviewer class."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.config = Config(
-            github_token="test_token",
-            openai_api_key="test_key"
-        )
-        self.reviewer = PRReviewer(self.config)
+    @pytest.fixture
+    def configured_reviewer(self, reviewer):
+        """Reviewer with an autospecced adapter cached for 'github'; returns (reviewer, adapter)"""
+        # Autospec the adapter so calls with the wrong signature fail loudly
+        mock_adapter = create_autospec(GitServerAdapter, instance=True)
+        # _get_server_adapter returns cached adapters without touching the factory
+        reviewer._adapters['github'] = mock_adapter
+        return reviewer, mock_adapter
     
-    def test_initialization(self):
+    def test_initialization(self, reviewer, reviewer_config_file):
         """Test PRReviewer initialization."""
-        assert self.reviewer.config == self.config
-        assert self.reviewer.adapter is None
-        assert self.reviewer.feedback_manager is not None
-        assert self.reviewer.analysis_manager is not None
-        assert self.reviewer.scorer is not None
-    
-    @patch('pr_review_agent.adapters.base.AdapterFactory.create_adapter')
-    def test_setup_adapter_github(self, mock_create_adapter):
-        """Test setting up GitHub adapter."""
-        mock_adapter = Mock()
-        mock_create_adapter.return_value = mock_adapter
-        
-        self.reviewer.setup_adapter('github')
-        
-        assert self.reviewer.adapter == mock_adapter
-        mock_create_adapter.assert_called_once_with('github', self.config)
+        assert reviewer.config.config_path == str(reviewer_config_file)
+        assert set(reviewer.config.servers) == {"github", "gitlab"}
+        assert reviewer._adapters == {}
+        assert reviewer.feedback_manager is not None
+        assert reviewer.analysis_manager is not None
+        assert reviewer.scorer is not None
     
-    @patch('pr_review_agent.adapters.base.AdapterFactory.create_adapter')
-    def test_setup_adapter_gitlab(self, mock_create_adapter):
-        """Test setting up GitLab adapter."""
-        mock_adapter = Mock()
-        mock_create_adapter.return_value = mock_adapter
-        
-        self.reviewer.setup_adapter('gitlab')
+    @pytest.mark.parametrize("name,expected_args", [
+        pytest.param("github", ("github", "https://api.github.com", "test_token", 30), id="github"),
+        pytest.param("gitlab", ("gitlab", "https://gitlab.com/api", "test_token", 60), id="gitlab"),
+    ])
+    def test_get_server_adapter(self, reviewer, name, expected_args):
+        """Test building configured adapters once and reusing them."""
+        server_type, base_url, token, timeout = expected_args
+        
+        with patch('pr_review_agent.adapters.base.AdapterFactory.create_adapter') as mock_create_adapter:
+            mock_adapter = Mock(spec=GitServerAdapter)
+            mock_create_adapter.return_value = mock_adapter
+            
+            assert reviewer._get_server_adapter(name) is mock_adapter
+            assert reviewer._get_server_adapter(name) is mock_adapter
         
-        assert self.reviewer.adapter == mock_adapter
-        mock_create_adapter.assert_called_once_with('gitlab', self.config)
+        mock_create_adapter.assert_called_once_with(server_type, base_url, token, timeout=timeout)
     
-    def test_setup_adapter_invalid(self):
-        """Test setting up invalid adapter raises error."""
-        with pytest.raises(ValueError, match="Unsupported git server"):
-            self.reviewer.setup_adapter('invalid_server')
+    def test_get_server_adapter_unknown_server(self, reviewer):
+        """Test an unconfigured server name is rejected."""
+        with pytest.raises(ValueError, match="No configuration found for server: invalid_server"):
+            reviewer._get_server_adapter("invalid_server")
     
-    @patch('pr_review_agent.core.reviewer.PRReviewer.setup_adapter')
-    def test_review_pr_success(self, mock_setup_adapter):
+    def test_review_pr_success(self, configured_reviewer):
         """Test successful PR review."""
-        # Mock adapter
-        mock_adapter = Mock()
-        mock_setup_adapter.return_value = None
-        self.reviewer.adapter = mock_adapter
-        
-        # Mock PR info
-        pr_info = PRInfo(
-            title="Test PR",
-            description="Test description",
-            author="test_user",
-            files_changed=[
-                FileChange(
-                    path="test.py",
-                    content="def test(): pass",
-                    change_type="modified",
-                    additions=1,
-                    deletions=0
-                )
-            ]
+        reviewer, mock_adapter = configured_reviewer
+        
+        file_change = FileChange(
+            filename="test.py",
+            status="modified",
+            additions=1,
+            deletions=0,
+            patch="@@ -0,0 +1 @@",
+            content_after="def test(): pass"
         )
-        mock_adapter.get_pr_info.return_value = pr_info
+        mock_adapter.get_pr_info.return_value = _PR_INFO
+        mock_adapter.get_pr_files.return_value = [file_change]
+        mock_adapter.post_review.return_value = True
         
-        # Mock analysis results
         analysis_result = AnalysisResult(
             file_path="test.py",
             issues=[],
             metrics={'complexity': 1},
-            suggestions=[]
+            language='python'
+        )
+        
+        mock_analyze = Mock(return_value={'test.py': [analysis_result]})
+        mock_feedback = Mock(return_value=_AI_FEEDBACK)
+        score_breakdown = ScoreBreakdown(
+            overall_score=85,
+            category_scores={'security': 90, 'performance': 80},
+            metrics={},
+            grade='B',
+            summary=''
         )
         
-        with patch.object(self.reviewer.analysis_manager, 'analyze_files') as mock_analyze:
-            with patch.object(self.reviewer.feedback_manager, 'generate_feedback') as mock_feedback:
-                with patch.object(self.reviewer.scorer, 'calculate_score') as mock_score:
-                    with patch.object(mock_adapter, 'post_review') as mock_post:
-                        
-                        mock_analyze.return_value = {'test.py': analysis_result}
-                        mock_feedback.return_value = "Great code!"
-                        mock_score.return_value = Mock(overall_score=85, grade='B')
-                        
-                        result = self.reviewer.review_pr('github', 'owner/repo', 123)
-                        
-                        assert isinstance(result, ReviewSummary)
-                        assert result.overall_score == 85
-                        assert result.grade == 'B'
-                        
-                        mock_adapter.get_pr_info.assert_called_once_with('owner/repo', 123)
-                        mock_analyze.assert_called_once()
-                        mock_feedback.assert_called_once()
-                        mock_score.assert_called_once()
-                        mock_post.assert_called_once()
+        with patch.multiple(reviewer.analysis_manager, analyze_files=mock_analyze), \
+             patch.multiple(reviewer.feedback_manager, generate_review_feedback=mock_feedback), \
+             patch.object(reviewer.scorer, 'calculate_score', return_value=score_breakdown) as mock_score:
+            result = reviewer.review_pr('github', 'owner/repo', 123)
+        
+        assert result['success'] is True
+        assert result['score_breakdown'] is score_breakdown
+        review_summary = result['review_summary']
+        assert isinstance(review_summary, ReviewSummary)
+        assert review_summary.overall_score == 85
+        assert review_summary.recommendation == 'approve'
+        
+        mock_adapter.get_pr_info.assert_called_once_with('owner/repo', 123)
+        mock_adapter.get_pr_files.assert_called_once_with('owner/repo', 123)
+        mock_analyze.assert_called_once_with({'test.py': 'def test(): pass'})
+        mock_feedback.assert_called_once_with([file_change], {'test.py': [analysis_result]})
+        mock_score.assert_called_once_with(_PR_INFO, [file_change], {'test.py': [analysis_result]})
+        mock_adapter.post_review.assert_called_once_with('owner/repo', 123, review_summary)
+        mock_adapter.update_pr_status.assert_called_once_with(
+            'owner/repo', 123, 'success', 'PR Review Agent: B (85.0/100)'
+        )
     
-    def test_review_pr_no_adapter(self):
-        """Test review fails when no adapter is set up."""
-        with pytest.raises(RuntimeError, match="No adapter configured"):
-            self.reviewer.review_pr('github', 'owner/repo', 123)
+    def test_review_pr_no_adapter(self, reviewer):
+        """Test review fails when no adapter is configured for the server."""
+        result = reviewer.review_pr('bitbucket', 'owner/repo', 123)
+        
+        assert result['success'] is False
+        assert result['error'] == "No configuration found for server: bitbucket"
     
-    @patch('pr_review_agent.core.reviewer.PRReviewer.setup_adapter')
-    def test_review_pr_adapter_error(self, mock_setup_adapter):
+    def test_review_pr_adapter_error(self, configured_reviewer):
         """Test review handles adapter errors."""
-        mock_adapter = Mock()
-        mock_setup_adapter.return_value = None
-        self.reviewer.adapter = mock_adapter
-        
+        reviewer, mock_adapter = configured_reviewer
         mock_adapter.get_pr_info.side_effect = Exception("API Error")
         
-        with pytest.raises(Exception, match="API Error"):
-            self.reviewer.review_pr('github', 'owner/repo', 123)
+        result = reviewer.review_pr('github', 'owner/repo', 123)
+        
+        assert result == {'success': False, 'error': 'API Error'}
+        mock_adapter.post_review.assert_not_called()
     
-    def test_analyze_files_success(self):
+    def test_analyze_files_success(self, reviewer):
         """Test successful file analysis."""
-        files = [
-            FileChange(
-                path="test1.py",
-                content="def test1(): pass",
-                change_type="added",
-                additions=1,
-                deletions=0
-            ),
-            FileChange(
-                path="test2.js",
-                content="function test2() {}",
-                change_type="modified",
-                additions=1,
-                deletions=1
-            )
-        ]
+        files = {
+            "test1.py": "def test1(): pass",
+            "test2.js": "function test2() {}"
+        }
         
         analysis_result1 = AnalysisResult(
             file_path="test1.py",
             issues=[],
             metrics={'complexity': 1},
-            suggestions=[]
+            language='python'
         )
         
         analysis_result2 = AnalysisResult(
             file_path="test2.js",
             issues=[],
             metrics={'complexity': 2},
-            suggestions=[]
+            language='javascript'
         )
         
-        with patch.object(self.reviewer.analysis_manager, 'analyze_files') as mock_analyze:
+        with patch.object(reviewer.analysis_manager, 'analyze_files') as mock_analyze:
             mock_analyze.return_value = {
-                'test1.py': analysis_result1,
-                'test2.js': analysis_result2
+                'test1.py': [analysis_result1],
+                'test2.js': [analysis_result2]
             }
             
-            results = self.reviewer.analyze_files(files)
-            
-            assert len(results) == 2
-            assert 'test1.py' in results
-            assert 'test2.js' in results
-            assert results['test1.py'] == analysis_result1
-            assert results['test2.js'] == analysis_result2
+            result = reviewer.analyze_files(files)
+        
+        mock_analyze.assert_called_once_with(files)
+        assert result['success'] is True
+        assert result['analysis_results'] == {
+            'test1.py': [analysis_result1],
+            'test2.js': [analysis_result2]
+        }
+        assert result['summary_metrics']['files_analyzed'] == 2
     
-    def test_analyze_files_empty(self):
+    def test_analyze_files_empty(self, reviewer):
         """Test analyzing empty file list."""
-        results = self.reviewer.analyze_files([])
+        result = reviewer.analyze_files({})
         
-        assert results == {}
+        assert result['success'] is True
+        assert result['analysis_results'] == {}
+        assert result['summary_metrics']['total_issues'] == 0
     
-    def test_analyze_files_with_filtering(self):
-        """Test file analysis with size filtering."""
-        # Create a config with small max file size
-        config = Config(max_file_size=10)
-        reviewer = PRReviewer(config)
-        
-        files = [
-            FileChange(
-                path="small.py",
-                content="def test(): pass",  # Small file
-                change_type="added",
-                additions=1,
-                deletions=0
-            ),
-            FileChange(
-                path="large.py", 
-                content="def test(): pass" * 100,  # Large file
-                change_type="added",
-                additions=1,
-                deletions=0
-            )
-        ]
-        
-        with patch.object(reviewer.analysis_manager, 'analyze_files') as mock_analyze:
-            mock_analyze.return_value = {'small.py': Mock()}
-            
-            results = reviewer.analyze_files(files)
-            
-            # Only small file should be analyzed
-            mock_analyze.assert_called_once()
-            called_files = mock_analyze.call_args[0][0]
-            assert len(called_files) == 1
-            assert called_files[0].path == "small.py"
+    def test_analyze_files_with_filtering(self, reviewer):
+        """Test file analysis skips files matching the exclude patterns."""
+        result = reviewer.analyze_files({
+            "small.py": "def test(): pass",
+            "vendor.min.js": "var x = 1;"
+        })
+        
+        assert result['success'] is True
+        assert set(result['analysis_results']) == {"small.py"}
     
-    @patch('pr_review_agent.core.reviewer.PRReviewer.setup_adapter')
-    def test_generate_summary(self, mock_setup_adapter):
+    def test_generate_summary(self, reviewer):
         """Test generating review summary."""
-        mock_adapter = Mock()
-        self.reviewer.adapter = mock_adapter
-        
-        pr_info = PRInfo(
-            title="Test PR",
-            description="Test description", 
-            author="test_user",
-            files_changed=[]
+        issue = CodeIssue(
+            line_number=3,
+            column=0,
+            severity='error',
+            category='security',
+            message='Use of eval()',
+            rule_id='dangerous_eval'
         )
-        
         analysis_results = {
-            'test.py': AnalysisResult(
+            'test.py': [AnalysisResult(
                 file_path='test.py',
-                issues=[],
+                issues=[issue],
                 metrics={'complexity': 1},
-                suggestions=[]
-            )
+                language='python'
+            )]
         }
         
-        feedback = "Great code!"
-        scorecard = Mock()
-        scorecard.overall_score = 85
-        scorecard.grade = 'B'
-        scorecard.category_scores = {'security': 90, 'performance': 80}
-        
-        summary = self.reviewer._generate_summary(
-            pr_info, analysis_results, feedback, scorecard
+        scorecard = ScoreBreakdown(
+            overall_score=85,
+            grade='B',
+            category_scores={'security': 90, 'performance': 80},
+            metrics={},
+            summary=''
         )
         
+        summary = reviewer._create_review_summary(_AI_FEEDBACK, scorecard, analysis_results)
+        
         assert isinstance(summary, ReviewSummary)
         assert summary.overall_score == 85
-        assert summary.grade == 'B'
-        assert summary.feedback == feedback
-        assert len(summary.file_analyses) == 1
-        assert 'test.py' in summary.file_analyses
-    
-    def test_filter_files_by_size(self):
-        """Test filtering files by size."""
-        config = Config(max_file_size=20)
-        reviewer = PRReviewer(config)
-        
-        files = [
-            FileChange(path="small.py", content="short", change_type="added", additions=1, deletions=0),
-            FileChange(path="large.py", content="a" * 50, change_type="added", additions=1, deletions=0),
-        ]
-        
-        filtered = reviewer._filter_files(files)
-        
-        assert len(filtered) == 1
-        assert filtered[0].path == "small.py"
-    
-    def test_filter_files_by_extension(self):
-        """Test filtering files by extension."""
-        config = Config(supported_extensions=['.py', '.js'])
-        reviewer = PRReviewer(config)
-        
-        files = [
-            FileChange(path="test.py", content="python", change_type="added", additions=1, deletions=0),
-            FileChange(path="test.js", content="javascript", change_type="added", additions=1, deletions=0),
-            FileChange(path="test.txt", content="text", change_type="added", additions=1, deletions=0),
+        assert summary.recommendation == 'approve'
+        assert 'Grade: B' in summary.summary_message
+        assert _AI_FEEDBACK.summary in summary.summary_message
+        # Errors not already covered by AI comments are added as comments
+        assert [(c.file_path, c.line_number, c.message) for c in summary.comments] == [
+            ('test.py', 3, 'Use of eval()')
         ]
-        
-        filtered = reviewer._filter_files(files)
-        
-        assert len(filtered) == 2
-        assert any(f.path == "test.py" for f in filtered)
-        assert any(f.path == "test.js" for f in filtered)
-        assert not any(f.path == "test.txt" for f in filtered)
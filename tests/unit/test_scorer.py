@@ -1,6 +1,8 @@
 """
 Unit tests for PR scoring system
 """
+import dataclasses
+import operator
 import pytest
 from unittest.mock import Mock
 from datetime import datetime
@@ -8,163 +10,172 @@ from pr_review_agent.core.scorer import PRScorer, ScoreBreakdown
 from pr_review_agent.adapters.base import PRInfo, FileChange
 from pr_review_agent.analyzers.base import AnalysisResult, CodeIssue
 
+# Default test objects, built once; helpers return them as-is or via
+# dataclasses.replace, so tests must not mutate them
+_DEFAULT_PR_INFO = PRInfo(
+    id='123',
+    number=1,
+    title='Test PR',
+    description='Test description',
+    author='testuser',
+    source_branch='feature',
+    target_branch='main',
+    status='open',
+    created_at=datetime.now(),
+    updated_at=datetime.now(),
+    url='https://example.com/pr/1',
+    repository='owner/repo',
+    files_changed=['test.py'],
+    additions=10,
+    deletions=5,
+    commits=1
+)
+
+_DEFAULT_FILE_CHANGE = FileChange(
+    filename='test.py',
+    status='modified',
+    additions=5,
+    deletions=2,
+    patch='@@ -1,3 +1,3 @@',
+    content_before='old content',
+    content_after='new content'
+)
+
+_DEFAULT_ANALYSIS_RESULT = AnalysisResult(
+    file_path='test.py',
+    issues=[],
+    metrics={'lines_of_code': 100, 'functions': 5, 'classes': 1},
+    language='python'
+)
+
+_DEFAULT_CODE_ISSUE = CodeIssue(
+    line_number=10,
+    column=5,
+    severity='warning',
+    category='style',
+    message='Test issue',
+    rule_id='test_rule'
+)
+
+
+@pytest.fixture(scope="module")
+def mixed_severity_issues():
+    """One error, one warning and one info issue"""
+    return [
+        dataclasses.replace(_DEFAULT_CODE_ISSUE, severity=severity)
+        for severity in ('error', 'warning', 'info')
+    ]
+
+
+@pytest.fixture(scope="module")
+def perfect_pr_bundle():
+    """(pr_info, file_changes, analysis_results) for a PR with no issues"""
+    return _DEFAULT_PR_INFO, [_DEFAULT_FILE_CHANGE], {'test.py': [_DEFAULT_ANALYSIS_RESULT]}
+
+
+@pytest.fixture(scope="module")
+def security_pr_bundle():
+    """(pr_info, file_changes, analysis_results) for a PR with a security error"""
+    security_issue = dataclasses.replace(
+        _DEFAULT_CODE_ISSUE,
+        severity='error',
+        category='security',
+        rule_id='hardcoded_password'
+    )
+    analysis_result = dataclasses.replace(_DEFAULT_ANALYSIS_RESULT, issues=[security_issue])
+    
+    return _DEFAULT_PR_INFO, [_DEFAULT_FILE_CHANGE], {'test.py': [analysis_result]}
+
+
+@pytest.fixture(scope="module")
+def large_pr_bundle():
+    """(pr_info, file_changes, analysis_results) for a PR with more than 20 files"""
+    pr_info = dataclasses.replace(_DEFAULT_PR_INFO, additions=1000, deletions=500, commits=20)
+    
+    file_changes = [
+        dataclasses.replace(_DEFAULT_FILE_CHANGE, filename=f'file{i}.py')
+        for i in range(25)
+    ]
+    
+    analysis_results = {
+        f'file{i}.py': [_DEFAULT_ANALYSIS_RESULT]
+        for i in range(25)
+    }
+    
+    return pr_info, file_changes, analysis_results
+
 
 class TestPRScorer:
     """Test PR scoring functionality"""
     
-    def setup_method(self):
-        """Set up test fixtures"""
-        self.scorer = PRScorer()
+    # Default scorer holds no per-test state, so one instance serves the class
+    scorer: PRScorer = PRScorer()
     
     def create_mock_pr_info(self, **kwargs):
         """Create mock PR info for testing"""
-        defaults = {
-            'id': '123',
-            'number': 1,
-            'title': 'Test PR',
-            'description': 'Test description',
-            'author': 'testuser',
-            'source_branch': 'feature',
-            'target_branch': 'main',
-            'status': 'open',
-            'created_at': datetime.now(),
-            'updated_at': datetime.now(),
-            'url': 'https://example.com/pr/1',
-            'repository': 'owner/repo',
-            'files_changed': ['test.py'],
-            'additions': 10,
-            'deletions': 5,
-            'commits': 1
-        }
-        defaults.update(kwargs)
-        return PRInfo(**defaults)
+        return dataclasses.replace(_DEFAULT_PR_INFO, **kwargs) if kwargs else _DEFAULT_PR_INFO
     
     def create_mock_file_change(self, **kwargs):
         """Create mock file change for testing"""
-        defaults = {
-            'filename': 'test.py',
-            'status': 'modified',
-            'additions': 5,
-            'deletions': 2,
-            'patch': '@@ -1,3 +1,3 @@',
-            'content_before': 'old content',
-            'content_after': 'new content'
-        }
-        defaults.update(kwargs)
-        return FileChange(**defaults)
+        return dataclasses.replace(_DEFAULT_FILE_CHANGE, **kwargs) if kwargs else _DEFAULT_FILE_CHANGE
     
     def create_mock_analysis_result(self, issues=None, **kwargs):
         """Create mock analysis result for testing"""
-        if issues is None:
-            issues = []
+        if issues is not None:
+            kwargs['issues'] = issues
         
-        defaults = {
-            'file_path': 'test.py',
-            'issues': issues,
-            'metrics': {'lines_of_code': 100, 'functions': 5, 'classes': 1},
-            'language': 'python'
-        }
-        defaults.update(kwargs)
-        return AnalysisResult(**defaults)
-    
-    def create_code_issue(self, **kwargs):
-        """Create code issue for testing"""
-        defaults = {
-            'line_number': 10,
-            'column': 5,
-            'severity': 'warning',
-            'category': 'style',
-            'message': 'Test issue',
-            'rule_id': 'test_rule'
-        }
-        defaults.update(kwargs)
-        return CodeIssue(**defaults)
+        return dataclasses.replace(_DEFAULT_ANALYSIS_RESULT, **kwargs) if kwargs else _DEFAULT_ANALYSIS_RESULT
     
-    def test_calculate_score_perfect_code(self):
-        """Test scoring perfect code with no issues"""
-        pr_info = self.create_mock_pr_info()
-        file_changes = [self.create_mock_file_change()]
-        analysis_results = {
-            'test.py': [self.create_mock_analysis_result()]
-        }
-        
-        score_breakdown = self.scorer.calculate_score(pr_info, file_changes, analysis_results)
+    @pytest.mark.parametrize("bundle_name,expected", [
+        # Perfect code scores high across all six categories
+        pytest.param("perfect_pr_bundle", {
+            "overall_score": (operator.ge, 90),
+            "grade": (operator.eq, 'A'),
+            "category_count": (operator.eq, 6),
+        }, id='perfect'),
+        # Security issues lower the security and overall scores
+        pytest.param("security_pr_bundle", {
+            "category_scores.security": (operator.lt, 90),
+            "overall_score": (operator.lt, 90),
+        }, id='security'),
+        # Large PRs lower the maintainability score
+        pytest.param("large_pr_bundle", {
+            "category_scores.maintainability": (operator.lt, 90),
+        }, id='large', marks=pytest.mark.slow),
+    ])
+    def test_calculate_score(self, request, bundle_name, expected):
+        """Test scoring representative PRs"""
+        score_breakdown = self.scorer.calculate_score(*request.getfixturevalue(bundle_name))
         
         assert isinstance(score_breakdown, ScoreBreakdown)
-        assert score_breakdown.overall_score >= 90  # Should be high for perfect code
-        assert score_breakdown.grade == 'A'
-        assert len(score_breakdown.category_scores) == 6  # All categories
-    
-    def test_calculate_score_with_security_issues(self):
-        """Test scoring code with security issues"""
-        security_issue = self.create_code_issue(
-            severity='error',
-            category='security',
-            rule_id='hardcoded_password'
-        )
-        
-        pr_info = self.create_mock_pr_info()
-        file_changes = [self.create_mock_file_change()]
-        analysis_results = {
-            'test.py': [self.create_mock_analysis_result(issues=[security_issue])]
+        actual = {
+            "overall_score": score_breakdown.overall_score,
+            "grade": score_breakdown.grade,
+            "category_count": len(score_breakdown.category_scores),
+            **{f"category_scores.{name}": score
+               for name, score in score_breakdown.category_scores.items()},
         }
-        
-        score_breakdown = self.scorer.calculate_score(pr_info, file_changes, analysis_results)
-        
-        # Security score should be lower
-        assert score_breakdown.category_scores['security'] < 90
-        assert score_breakdown.overall_score < 90
-    
-    def test_calculate_score_large_pr(self):
-        """Test scoring large PR with many changes"""
-        pr_info = self.create_mock_pr_info(
-            additions=1000,
-            deletions=500,
-            commits=20
-        )
-        
-        # Create many file changes
-        file_changes = [
-            self.create_mock_file_change(filename=f'file{i}.py')
-            for i in range(25)  # More than 20 files
+        # Report every unmet expectation, not just the first
+        failures = [
+            f"{key}: {actual[key]!r} is not {op.__name__} {bound!r}"
+            for key, (op, bound) in expected.items()
+            if not op(actual[key], bound)
         ]
-        
-        analysis_results = {
-            f'file{i}.py': [self.create_mock_analysis_result()]
-            for i in range(25)
-        }
-        
-        score_breakdown = self.scorer.calculate_score(pr_info, file_changes, analysis_results)
-        
-        # Maintainability score should be lower for large PRs
-        assert score_breakdown.category_scores['maintainability'] < 90
+        assert not failures, failures
     
-    def test_calculate_test_coverage_score(self):
+    @pytest.mark.parametrize("files,op,threshold", [
+        # Good coverage: 2 test files for 2 source files
+        (['src/main.py', 'src/utils.py', 'tests/test_main.py', 'tests/test_utils.py'], operator.ge, 90),
+        # Low coverage: no test files
+        (['src/main.py', 'src/utils.py'], operator.lt, 50),
+    ])
+    def test_calculate_test_coverage_score(self, files, op, threshold):
         """Test test coverage scoring"""
-        # Create mix of source and test files
-        file_changes = [
-            self.create_mock_file_change(filename='src/main.py'),
-            self.create_mock_file_change(filename='src/utils.py'),
-            self.create_mock_file_change(filename='tests/test_main.py'),
-            self.create_mock_file_change(filename='tests/test_utils.py')
-        ]
+        file_changes = [self.create_mock_file_change(filename=f) for f in files]
         
         score = self.scorer._calculate_test_coverage_score(file_changes)
         
-        # Should have good test coverage (2 test files for 2 source files)
-        assert score >= 90
-    
-    def test_calculate_test_coverage_score_no_tests(self):
-        """Test test coverage scoring with no test files"""
-        file_changes = [
-            self.create_mock_file_change(filename='src/main.py'),
-            self.create_mock_file_change(filename='src/utils.py')
-        ]
-        
-        score = self.scorer._calculate_test_coverage_score(file_changes)
-        
-        # Should have low test coverage (no test files)
-        assert score < 50
+        assert op(score, threshold)
     
     def test_calculate_documentation_score(self):
         """Test documentation scoring"""
@@ -184,26 +195,23 @@ class TestPRScorer:
         # Should have good documentation score
         assert score >= 70
     
-    def test_assign_grade(self):
+    @pytest.mark.parametrize("score,grade", [
+        (95, 'A'),
+        (85, 'B'),
+        (70, 'C'),
+        (50, 'D'),
+        (30, 'F'),
+    ])
+    def test_assign_grade(self, score, grade):
         """Test grade assignment"""
-        assert self.scorer._assign_grade(95) == 'A'
-        assert self.scorer._assign_grade(85) == 'B'
-        assert self.scorer._assign_grade(70) == 'C'
-        assert self.scorer._assign_grade(50) == 'D'
-        assert self.scorer._assign_grade(30) == 'F'
+        assert self.scorer._assign_grade(score) == grade
     
-    def test_generate_metrics(self):
+    def test_generate_metrics(self, mixed_severity_issues):
         """Test metrics generation"""
-        issues = [
-            self.create_code_issue(severity='error'),
-            self.create_code_issue(severity='warning'),
-            self.create_code_issue(severity='info')
-        ]
-        
         pr_info = self.create_mock_pr_info()
         file_changes = [self.create_mock_file_change()]
         analysis_results = {
-            'test.py': [self.create_mock_analysis_result(issues=issues)]
+            'test.py': [self.create_mock_analysis_result(issues=mixed_severity_issues)]
         }
         
         metrics = self.scorer._generate_metrics(pr_info, file_changes, analysis_results)
@@ -289,4 +297,4 @@ class TestPRScorer:
 
 
 if __name__ == "__main__":
-    pytest.main([__file__])
+    pytest.main([__file__, "-p", "no:cacheprovider", "--no-header", "-q", "--import-mode=importlib"])